@@ -56,6 +56,10 @@ class ArticleAnalysisDatabase:
 
             cursor = conn.cursor()
 
+            # Let database_maintenance reclaim free pages without a full VACUUM
+            # (only takes effect on a brand new database file)
+            cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+
             # Create articles table
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS articles (
@@ -73,9 +77,15 @@ class ArticleAnalysisDatabase:
                 article_id INTEGER,
                 entity_text TEXT,
                 entity_type TEXT,
+                sentiment TEXT,
                 FOREIGN KEY (article_id) REFERENCES articles (id)
             )''')
 
+            # Databases created before per-entity sentiment lack the column
+            entity_columns = {row['name'] for row in cursor.execute('PRAGMA table_info(entities)')}
+            if 'sentiment' not in entity_columns:
+                cursor.execute('ALTER TABLE entities ADD COLUMN sentiment TEXT')
+
             # Create sentiment table
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS sentiments (
@@ -113,7 +123,7 @@ class ArticleAnalysisDatabase:
         :param url: Article URL
         :param title: Article title
         :param content: Article content
-        :param entities: List of named entities
+        :param entities: List of named entities, optionally with a 'sentiment' label each
         :param sentiment: Sentiment analysis result
         :return: Article ID or None if insertion fails
         """
@@ -135,11 +145,18 @@ class ArticleAnalysisDatabase:
             logging.info(f"Sentiment: {sentiment}")
 
             try:
+                # Upsert in place so the article keeps its id; INSERT OR REPLACE
+                # would assign a new id and orphan the old entities/sentiments
                 cursor.execute('''
-                    INSERT OR REPLACE INTO articles (url, title, content)
+                    INSERT INTO articles (url, title, content)
                     VALUES (?, ?, ?)
+                    ON CONFLICT(url) DO UPDATE SET
+                        title = excluded.title,
+                        content = excluded.content,
+                        analysis_timestamp = CURRENT_TIMESTAMP
                 ''', (url, title, content))
-                article_id = cursor.lastrowid
+                cursor.execute('SELECT id FROM articles WHERE url = ?', (url,))
+                article_id = cursor.fetchone()['id']
                 logging.info(f"Article inserted with ID: {article_id}")
 
                 # Clear existing entities and sentiments for this article to avoid duplicates
@@ -149,12 +166,13 @@ class ArticleAnalysisDatabase:
                 # Insert entities
                 if entities:
                     entity_data = [
-                        (article_id, entity.get('text', ''), entity.get('label', 'Unknown'))
+                        (article_id, entity.get('text', ''), entity.get('label', 'Unknown'),
+                         entity.get('sentiment'))
                         for entity in entities
                     ]
                     cursor.executemany('''
-                        INSERT INTO entities (article_id, entity_text, entity_type)
-                        VALUES (?, ?, ?)
+                        INSERT INTO entities (article_id, entity_text, entity_type, sentiment)
+                        VALUES (?, ?, ?, ?)
                     ''', entity_data)
                     logging.info(f"Inserted {len(entities)} entities")
 
@@ -215,8 +233,8 @@ class ArticleAnalysisDatabase:
 
             # Fetching entities
             cursor.execute('''
-                SELECT entity_text, entity_type 
-                FROM entities 
+                SELECT entity_text, entity_type, sentiment
+                FROM entities
                 WHERE article_id = ?
             ''', (article['id'],))
             entities = cursor.fetchall()
@@ -235,7 +253,10 @@ class ArticleAnalysisDatabase:
                 'title': article['title'],
                 'content': article['content'],
                 'timestamp': article['analysis_timestamp'],
-                'entities': [{'text': e['entity_text'], 'label': e['entity_type']} for e in entities],
+                'entities': [
+                    {'text': e['entity_text'], 'label': e['entity_type'], 'sentiment': e['sentiment']}
+                    for e in entities
+                ],
                 'sentiment': sentiment['sentiment'] if sentiment else None
             }
 
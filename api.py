@@ -0,0 +1,277 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import argparse
+from collections import OrderedDict, Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import uvicorn
+import gradio as gr
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app import ArticleAnalysisApp, create_gradio_interface
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    filename='article_analysis.log',
+    filemode='a'
+)
+
+
+class AnalyzeRequest(BaseModel):
+    url: str
+
+
+class BatchAnalyzeRequest(BaseModel):
+    urls: List[str]
+
+
+class AnalysisService:
+    def __init__(self, app, max_concurrency=8, cache_size=1024, max_batch_size=500):
+        """
+        Async front end to ArticleAnalysisApp for machine-to-machine traffic.
+
+        :param app: ArticleAnalysisApp instance
+        :param max_concurrency: Number of articles scraped and analyzed at the same time
+        :param cache_size: Number of results kept in the in-memory LRU cache
+        :param max_batch_size: Maximum number of URLs accepted by one batch request
+        """
+        self.app = app
+        self.cache_size = cache_size
+        self.max_batch_size = max_batch_size
+
+        # Scrapes can be slow; keep them off the default pool used for DB lookups
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+        self._cache = OrderedDict()
+        self._inflight = {}
+
+        self.metrics = Counter()
+        self.started_at = time.time()
+
+    def _cache_get(self, url):
+        result = self._cache.get(url)
+        if result is not None:
+            self._cache.move_to_end(url)
+        return result
+
+    def _cache_put(self, url, result):
+        self._cache[url] = result
+        self._cache.move_to_end(url)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _analyze_and_store(self, url):
+        """
+        Scrape, analyze and store an article (blocking, runs in the executor).
+
+        :param url: Article URL
+        :return: Stored analysis dictionary or error dictionary
+        """
+        article = self.app.web_scraper.scrape_article(url)
+        if article is None:
+            return {"Error": "Failed to scrape the article. Please check the URL."}
+
+        article_id = self.app.store_article_analysis(url, article)
+        if article_id is None:
+            return {"Error": "Database insertion failed. Check logs for details."}
+
+        return self.app.database.get_article_analysis(url)
+
+    async def _lookup_or_analyze(self, url):
+        """
+        Resolve a URL from the database, or analyze it if it has not been seen.
+
+        :param url: Article URL
+        :return: Tuple of (source, result)
+        """
+        loop = asyncio.get_running_loop()
+
+        stored = await loop.run_in_executor(None, self.app.database.get_article_analysis, url)
+        if stored:
+            return 'database', stored
+
+        start = time.time()
+        try:
+            result = await loop.run_in_executor(self.executor, self._analyze_and_store, url)
+        except Exception as e:
+            logging.error(f"API analysis error for {url}: {e}")
+            result = {"Error": f"An unexpected error occurred: {str(e)}"}
+        self.metrics['analysis_seconds_total'] += time.time() - start
+
+        return 'analyzed', result
+
+    async def analyze(self, url):
+        """
+        Return the analysis for a URL from cache, database or a fresh analysis.
+
+        Concurrent requests for the same URL share a single analysis.
+
+        :param url: Article URL
+        :return: Response dictionary with url, source and result or error
+        """
+        cached = self._cache_get(url)
+        if cached is not None:
+            self.metrics['cache_hits'] += 1
+            return {'url': url, 'source': 'cache', 'result': cached}
+
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._lookup_or_analyze(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+
+        source, result = await asyncio.shield(task)
+
+        if 'Error' in result:
+            self.metrics['errors'] += 1
+            return {'url': url, 'source': source, 'error': result['Error']}
+
+        self.metrics['database_hits' if source == 'database' else 'analyzed'] += 1
+        self._cache_put(url, result)
+        return {'url': url, 'source': source, 'result': result}
+
+    async def iter_batch(self, urls):
+        """
+        Analyze many URLs, yielding each response as soon as it is ready.
+
+        Duplicates are dropped. Cache hits are yielded first, the rest in
+        completion order, so a slow scrape does not hold back the others.
+
+        :param urls: List of article URLs
+        :return: Async iterator of response dictionaries
+        """
+        unique_urls = list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+
+        pending = []
+        for url in unique_urls:
+            if url in self._cache:
+                yield await self.analyze(url)
+            else:
+                pending.append(asyncio.ensure_future(self.analyze(url)))
+
+        try:
+            for next_done in asyncio.as_completed(pending):
+                yield await next_done
+        finally:
+            # Client went away; the shared analyses are shielded and keep running
+            for task in pending:
+                task.cancel()
+
+    def check_database(self):
+        """
+        Open a connection, run a trivial query and close it (blocking).
+
+        :return: True if the database answered
+        """
+        conn = self.app.database._get_connection()
+        if conn is None:
+            return False
+        try:
+            conn.execute('SELECT 1').fetchone()
+            return True
+        except Exception as e:
+            logging.error(f"Health check failed: {e}")
+            return False
+        finally:
+            conn.close()
+
+    def snapshot_metrics(self):
+        """
+        Return current counters plus cache and queue sizes.
+        """
+        metrics = dict(self.metrics)
+        metrics.update({
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'cache_size': len(self._cache),
+            'in_flight': len(self._inflight)
+        })
+        return metrics
+
+
+def create_api(app, max_concurrency=8, cache_size=1024, max_batch_size=500):
+    """
+    Create and return the JSON HTTP API.
+
+    :param app: ArticleAnalysisApp instance
+    :param max_concurrency: Number of articles analyzed at the same time
+    :param cache_size: Number of results kept in memory
+    :param max_batch_size: Maximum number of URLs per batch request
+    :return: FastAPI application
+    """
+    service = AnalysisService(app, max_concurrency, cache_size, max_batch_size)
+    api = FastAPI(title="Sentiment Analysis for News articles")
+    api.state.service = service
+
+    @api.post('/analyze')
+    async def analyze(request: AnalyzeRequest):
+        service.metrics['requests'] += 1
+        url = request.url.strip()
+        if not url:
+            raise HTTPException(status_code=422, detail="URL must not be empty")
+
+        response = await service.analyze(url)
+        if 'error' in response:
+            raise HTTPException(status_code=502, detail=response['error'])
+        return response
+
+    @api.post('/analyze/batch')
+    async def analyze_batch(request: BatchAnalyzeRequest):
+        service.metrics['batch_requests'] += 1
+        if len(request.urls) > service.max_batch_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch exceeds the limit of {service.max_batch_size} URLs"
+            )
+
+        # One JSON object per line (NDJSON), written as each URL completes
+        async def lines():
+            async for response in service.iter_batch(request.urls):
+                yield json.dumps(response) + '\n'
+
+        return StreamingResponse(lines(), media_type='application/x-ndjson')
+
+    @api.get('/health')
+    async def health():
+        loop = asyncio.get_running_loop()
+        # The sqlite connection must be opened and closed on the same thread
+        if not await loop.run_in_executor(None, service.check_database):
+            raise HTTPException(status_code=503, detail="Database unavailable")
+        return {'status': 'ok'}
+
+    @api.get('/metrics')
+    async def metrics():
+        return service.snapshot_metrics()
+
+    return api
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON HTTP API for article analysis")
+    parser.add_argument('--host', default=os.environ.get('API_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('API_PORT', 8000)))
+    parser.add_argument('--max-concurrency', type=int, default=8)
+    parser.add_argument('--cache-size', type=int, default=1024)
+    parser.add_argument('--lexicon', help="Sentiment lexicon file (default: $SENTIMENT_LEXICON)")
+    parser.add_argument('--profiles', help="Extraction profiles file (default: $EXTRACTION_PROFILES, "
+                                           "else extraction_profiles.json next to the database)")
+    parser.add_argument('--with-gradio', action='store_true',
+                        help="Also serve the Gradio UI under /ui")
+    args = parser.parse_args()
+
+    app = ArticleAnalysisApp(profiles_path=args.profiles, lexicon_path=args.lexicon)
+    api = create_api(app, max_concurrency=args.max_concurrency, cache_size=args.cache_size)
+
+    if args.with_gradio:
+        api = gr.mount_gradio_app(api, create_gradio_interface(app), path='/ui')
+
+    uvicorn.run(api, host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
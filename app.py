@@ -1,10 +1,14 @@
 import os
+import asyncio
 import logging
 import gradio as gr
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from webscrapping import WebScraper
+from extraction_profiles import ExtractionProfiles, PROFILES_ENV
 from name_entity import EntityExtractor
 from sentiment_analysis import SentimentAnalyzer
+from article_analyzer import ArticleAnalyzer
 from ArticleAnalysisDatabse import ArticleAnalysisDatabase
 
 logging.basicConfig(
@@ -15,19 +19,30 @@ logging.basicConfig(
 )
 
 class ArticleAnalysisApp:
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, profiles_path=None, lexicon_path=None):
         """
         Initialize the Article Analysis Application.
         
         :param db_path: Optional custom path for the database file
+        :param profiles_path: Optional extraction profiles file (default:
+            $EXTRACTION_PROFILES if set, otherwise extraction_profiles.json
+            next to the database)
+        :param lexicon_path: Optional sentiment lexicon file (default:
+            $SENTIMENT_LEXICON if set)
         """
-        # Initialization
-        self.web_scraper = WebScraper()
-        self.entity_extractor = EntityExtractor()
-        self.sentiment_analyzer = SentimentAnalyzer()
-        
         # Initialization of database
         self.database = ArticleAnalysisDatabase(db_path)
+        
+        # Learned extraction strategies persist across restarts with the database
+        if profiles_path is None:
+            profiles_path = os.environ.get(PROFILES_ENV) or os.path.join(
+                os.path.dirname(self.database.db_path), 'extraction_profiles.json')
+        
+        # Initialization
+        self.web_scraper = WebScraper(profiles=ExtractionProfiles.shared(profiles_path))
+        self.entity_extractor = EntityExtractor()
+        self.sentiment_analyzer = SentimentAnalyzer(lexicon_path or os.environ.get('SENTIMENT_LEXICON'))
+        self.article_analyzer = ArticleAnalyzer(self.entity_extractor, self.sentiment_analyzer)
 
     def analyze_article(self, url):
         """
@@ -36,11 +51,28 @@ class ArticleAnalysisApp:
         :param url: URL of the article to analyze.
         :return: Formatted analysis results or error dictionary.
         """
+        result = None
+        for result in self.analyze_article_stream(url):
+            pass
+        return result
+
+    def analyze_article_stream(self, url):
+        """
+        Analyze an article, yielding the formatted result as each stage completes.
+
+        Yields the title first, then the content, entities and sentiment, so
+        callers can display partial results while the slower stages run.
+        The last value yielded is the complete result or an error dictionary.
+        
+        :param url: URL of the article to analyze.
+        :return: Generator of partial formatted results or error dictionary.
+        """
         try:
             existing_analysis = self.database.get_article_analysis(url)
             if existing_analysis:
                 logging.info(f"Found existing analysis for URL: {url}")
-                return self._format_existing_analysis(existing_analysis)
+                yield self._format_existing_analysis(existing_analysis)
+                return
 
             # Scrapping article
             logging.info(f"Scraping article from URL: {url}")
@@ -49,16 +81,25 @@ class ArticleAnalysisApp:
             if article is None:
                 error_msg = "Failed to scrape the article. Please check the URL."
                 logging.error(error_msg)
-                return {"Error": error_msg}
+                yield {"Error": error_msg}
+                return
 
-            # Extracting named entities
-            logging.info("Extracting named entities.")
-            entities = self.entity_extractor.extract_entities(article['text'])
-            
-            # Performing sentiment analysis
-            logging.info("Performing sentiment analysis.")
-            sentiment = self.sentiment_analyzer.analyze_sentiment(article['text'])
+            result = {'Title': article['title']}
+            yield dict(result)
+
+            result['Content'] = self._truncate_content(article['text'])
+            yield dict(result)
+
+            # Extracting named entities and sentiment in one pass
+            logging.info("Extracting named entities and performing sentiment analysis.")
+            analysis = self.article_analyzer.analyze(article['text'])
+            entities = analysis['entities']
+            sentiment = analysis['sentiment']
             logging.info(f"Sentiment result: {sentiment}")
+            result['Entities'] = self._format_entities(entities)
+            yield dict(result)
+
+            result['Sentiment'] = f"Overall Sentiment: {sentiment}"
 
             # Storing analysis in database
             try:
@@ -72,39 +113,75 @@ class ArticleAnalysisApp:
 
                 if article_id is None:
                     logging.error("Failed to store article analysis in the database.")
-                    return {"Error": "Database insertion failed. Check logs for details."}
+                    yield {"Error": "Database insertion failed. Check logs for details."}
+                    return
 
                 logging.info(f"Article analysis stored with ID: {article_id}")
 
             except Exception as db_error:
                 logging.error(f"Database insertion error: {db_error}")
-                return {"Error": f"Database error: {str(db_error)}"}
+                yield {"Error": f"Database error: {str(db_error)}"}
+                return
 
-            return self._format_analysis_result(article, entities, sentiment)
+            yield self._format_analysis_result(article, entities, sentiment)
 
         except Exception as e:
             logging.error(f"Comprehensive analysis error: {e}")
             traceback.print_exc()
-            return {"Error": f"An unexpected error occurred: {str(e)}"}
+            yield {"Error": f"An unexpected error occurred: {str(e)}"}
 
-    def _format_existing_analysis(self, existing_analysis):
+    def store_article_analysis(self, url, article):
         """
-        Format existing analysis from database.
+        Run entity extraction and sentiment analysis on an already scraped
+        article and store the result.
         
-        :param existing_analysis: Dictionary of existing analysis
-        :return: Formatted analysis result
+        :param url: URL of the article
+        :param article: Scraped article dictionary with 'title' and 'text'
+        :return: Article ID or None if insertion fails
+        """
+        analysis = self.article_analyzer.analyze(article['text'])
+        return self.database.insert_article_analysis(
+            url, article['title'], article['text'], analysis['entities'], analysis['sentiment']
+        )
+
+    def _format_entities(self, entities):
+        """
+        Format a list of entities for display.
+        
+        :param entities: List of entity dictionaries
+        :return: Formatted entities text
         """
         entities_text = "Persons and Organizations:\n"
-        if existing_analysis['entities']:
-            for entity in existing_analysis['entities']:
-                entities_text += f"- {entity['text']} (Type: {entity['label']})\n"
+        if entities:
+            for entity in entities:
+                if entity.get('sentiment'):
+                    entities_text += f"- {entity['text']} (Type: {entity['label']}, Sentiment: {entity['sentiment']})\n"
+                else:
+                    entities_text += f"- {entity['text']} (Type: {entity['label']})\n"
         else:
             entities_text += "No named entities found."
+        return entities_text
 
+    def _truncate_content(self, content):
+        """
+        Truncate article content for display.
+        
+        :param content: Full article content
+        :return: Content limited to 1000 characters
+        """
+        return content[:1000] + '...' if len(content) > 1000 else content
+
+    def _format_existing_analysis(self, existing_analysis):
+        """
+        Format existing analysis from database.
+        
+        :param existing_analysis: Dictionary of existing analysis
+        :return: Formatted analysis result
+        """
         return {
             'Title': existing_analysis['title'],
-            'Content': existing_analysis['content'][:1000] + '...' if len(existing_analysis['content']) > 1000 else existing_analysis['content'],
-            'Entities': entities_text,
+            'Content': self._truncate_content(existing_analysis['content']),
+            'Entities': self._format_entities(existing_analysis['entities']),
             'Sentiment': f"Overall Sentiment: {existing_analysis['sentiment']}"
         }
 
@@ -117,37 +194,39 @@ class ArticleAnalysisApp:
         :param sentiment: Sentiment analysis result
         :return: Formatted analysis dictionary
         """
-        entities_text = "Persons and Organizations:\n"
-        if entities:
-            for entity in entities:
-                entities_text += f"- {entity['text']} (Type: {entity['label']})\n"
-        else:
-            entities_text += "No named entities found."
-
         return {
             'Title': article['title'],
-            'Content': article['text'][:1000] + '...' if len(article['text']) > 1000 else article['text'],
-            'Entities': entities_text,
+            'Content': self._truncate_content(article['text']),
+            'Entities': self._format_entities(entities),
             'Sentiment': f"Overall Sentiment: {sentiment}"
         }
 
-def create_gradio_interface(app):
+def create_gradio_interface(app, concurrency_count=None, max_queue_size=None):
     """
     Create and return the Gradio interface.
     
     :param app: ArticleAnalysisApp instance
+    :param concurrency_count: Number of analyses run at the same time
+        (default: GRADIO_CONCURRENCY environment variable or 4)
+    :param max_queue_size: Maximum number of queued requests before new ones
+        are rejected (default: GRADIO_MAX_QUEUE environment variable or 64)
     :return: Gradio interface
     """
-    def process_url(url):
+    if concurrency_count is None:
+        concurrency_count = int(os.environ.get('GRADIO_CONCURRENCY', 4))
+    if max_queue_size is None:
+        max_queue_size = int(os.environ.get('GRADIO_MAX_QUEUE', 64))
+
+    # Blocking scrape/NER/DB work runs here, off the event loop
+    executor = ThreadPoolExecutor(max_workers=concurrency_count)
+
+    def to_outputs(result):
         """
-        Wrapper function to handle Gradio's multiple output requirement.
+        Convert a (partial) result dictionary to Gradio's multiple outputs.
         """
-        result = app.analyze_article(url)
-        
         if isinstance(result, dict) and 'Error' in result:
             return result['Error'], '', '', ''
         
-        # Return formatted results
         return (
             result.get('Title', ''),
             result.get('Content', ''),
@@ -155,6 +234,19 @@ def create_gradio_interface(app):
             result.get('Sentiment', '')
         )
 
+    async def process_url(url):
+        """
+        Stream partial results to the interface as each analysis stage completes.
+        """
+        loop = asyncio.get_running_loop()
+        stream = app.analyze_article_stream(url)
+
+        while True:
+            result = await loop.run_in_executor(executor, next, stream, None)
+            if result is None:
+                break
+            yield to_outputs(result)
+
     # Creating Gradio interface with multiple outputs
     iface = gr.Interface(
         fn=process_url,
@@ -171,6 +263,9 @@ def create_gradio_interface(app):
         allow_flagging="never"
     )
 
+    # Streaming outputs require the queue; it also bounds concurrent work
+    iface.queue(concurrency_count=concurrency_count, max_size=max_queue_size)
+
     return iface
 
 def main():
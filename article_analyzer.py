@@ -0,0 +1,109 @@
+import string
+from collections import defaultdict
+
+from name_entity import EntityExtractor
+from sentiment_analysis import SentimentAnalyzer
+
+# Characters removed from tokens, matching SentimentAnalyzer.preprocess_text
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+
+class ArticleAnalyzer:
+    def __init__(self, entity_extractor=None, sentiment_analyzer=None, max_length=512, entity_threshold=0):
+        """
+        Combined NER and sentiment analysis over a single spaCy tokenization.
+
+        :param entity_extractor: EntityExtractor providing the spaCy pipeline
+        :param sentiment_analyzer: SentimentAnalyzer providing the lexicon
+        :param max_length: Number of leading characters used for document
+            sentiment, as in SentimentAnalyzer.analyze_sentiment
+        :param entity_threshold: Score an entity's sentences must exceed for a
+            non-neutral label. Lower than the document threshold because an
+            entity is often scored from a single sentence
+        """
+        self.entity_extractor = entity_extractor or EntityExtractor()
+        self.sentiment_analyzer = sentiment_analyzer or SentimentAnalyzer()
+        self.max_length = max_length
+        self.entity_threshold = entity_threshold
+
+        # The lexicon compiled with the same spaCy tokenization as the text,
+        # so terms like "all-time high" split the same way on both sides
+        self.matcher = self.sentiment_analyzer.build_matcher(self._tokenize_term)
+
+    def _tokenize_term(self, term):
+        """
+        Tokenize a lexicon term the way analyze() tokenizes text
+
+        :param term: Word or phrase
+        :return: List of normalized tokens
+        """
+        tokens = (self._normalize(token) for token in self.entity_extractor.nlp.tokenizer(term))
+        return [token for token in tokens if token]
+
+    def _normalize(self, token):
+        """
+        Map a spaCy token to the form the lexicon matcher expects
+
+        Clause punctuation is kept so it can end a negation; other
+        punctuation and whitespace are dropped.
+
+        :param token: SpaCy Token
+        :return: Normalized token text or None
+        """
+        if token.is_space:
+            return None
+        if token.is_punct:
+            return token.text if token.text in self.sentiment_analyzer.reset_words else None
+        return token.lower_.translate(_PUNCTUATION_TABLE) or None
+
+    def analyze(self, text):
+        """
+        Extract entities, document sentiment and per-entity sentiment in one pass
+
+        Each entity's sentiment is scored from the sentences that mention it.
+
+        :param text: Article text
+        :return: Dictionary with 'entities' (one per mention, as returned by
+            EntityExtractor.extract_entities plus a 'sentiment' label) and
+            'sentiment' (document label)
+        """
+        doc = self.entity_extractor.nlp(text)
+        matcher = self.matcher
+        label_for_score = self.sentiment_analyzer.label_for_score
+
+        normalized = [self._normalize(token) for token in doc]
+
+        # Document sentiment over the same leading window as analyze_sentiment
+        document_tokens = [
+            norm for token, norm in zip(doc, normalized)
+            if norm is not None and token.idx < self.max_length
+        ]
+        document_sentiment = label_for_score(matcher.score(document_tokens))
+
+        # Without sentence boundaries every mention is scored against the whole text
+        has_sentences = doc.has_annotation('SENT_START')
+        sentence_scores = {}
+        entity_sentences = defaultdict(set)
+
+        mentions = []
+        for ent in self.entity_extractor.entity_spans(doc):
+            start, end = (ent.sent.start, ent.sent.end) if has_sentences else (0, len(doc))
+            if start not in sentence_scores:
+                tokens = [norm for norm in normalized[start:end] if norm is not None]
+                sentence_scores[start] = matcher.score(tokens)
+
+            key = (ent.text, ent.label_)
+            entity_sentences[key].add(start)
+            mentions.append(key)
+
+        entity_sentiment = {
+            key: label_for_score(sum(sentence_scores[start] for start in starts), self.entity_threshold)
+            for key, starts in entity_sentences.items()
+        }
+
+        entities = [
+            {'text': entity_text, 'label': label, 'sentiment': entity_sentiment[(entity_text, label)]}
+            for entity_text, label in mentions
+        ]
+
+        return {'entities': entities, 'sentiment': document_sentiment}
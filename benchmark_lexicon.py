@@ -0,0 +1,148 @@
+import sys
+import time
+import random
+import string
+
+from sentiment_analysis import SentimentAnalyzer
+from sentiment_lexicon import LexiconMatcher
+
+
+def legacy_score(analyzer, words):
+    """
+    The per-word loop SentimentAnalyzer used before the compiled matcher
+    (single words only), kept unchanged here as the benchmark baseline.
+    """
+    sentiment_score = 0
+    negation_active = False
+
+    for i, word in enumerate(words):
+        if word in analyzer.intensity_multipliers:
+            if i + 1 < len(words):
+                multiplier = analyzer.intensity_multipliers[word]
+                next_word = words[i+1]
+                if next_word in analyzer.positive_words:
+                    sentiment_score += 1 * multiplier
+                elif next_word in analyzer.negative_words:
+                    sentiment_score -= 1 * multiplier
+
+        if word in analyzer.negation_words:
+            negation_active = not negation_active
+
+        if word in analyzer.positive_words:
+            sentiment_score += 1 if not negation_active else -1
+
+        if word in analyzer.negative_words:
+            sentiment_score -= 1 if not negation_active else 1
+
+        if word in {'.', ',', ';', 'and', 'but', 'or'}:
+            negation_active = False
+
+    return sentiment_score
+
+
+def naive_phrase_score(phrases, words):
+    """
+    Phrase support bolted onto the loop: compare every phrase at every
+    position. Cost grows with the lexicon size.
+    """
+    sentiment_score = 0
+    for i in range(len(words)):
+        for phrase, weight in phrases:
+            if words[i:i + len(phrase)] == phrase:
+                sentiment_score += weight
+    return sentiment_score
+
+
+def random_word(rng):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+
+def build_lexicon(rng, size):
+    """
+    Synthetic lexicon: roughly a third multi-word phrases
+    """
+    entries = []
+    for _ in range(size):
+        words = [random_word(rng) for _ in range(rng.choice([1, 1, 2, 3]))]
+        entries.append((' '.join(words), rng.choice(['positive', 'negative']), 1.0))
+    return entries
+
+
+def build_text(rng, analyzer, entries, length):
+    """
+    Token stream mixing filler words, built-in words and lexicon phrases
+    """
+    vocabulary = (list(analyzer.positive_words) + list(analyzer.negative_words)
+                  + list(analyzer.intensity_multipliers) + list(analyzer.negation_words)
+                  + ['and', 'but', 'or'])
+    tokens = []
+    while len(tokens) < length:
+        roll = rng.random()
+        if roll < 0.7:
+            tokens.append(random_word(rng))
+        elif roll < 0.9:
+            tokens.append(rng.choice(vocabulary))
+        else:
+            tokens.extend(rng.choice(entries)[0].split())
+    return tokens[:length]
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def check_equivalence(analyzer, inverting, rng, samples=2000):
+    """
+    The default compiled matcher must score built-in lexicon text exactly like
+    the old loop; report how often invert_negated_negatives changes the label
+    """
+    changed = 0
+    for _ in range(samples):
+        words = build_text(rng, analyzer, [('good', 'positive', 1.0)], rng.randint(1, 40))
+        legacy = legacy_score(analyzer, words)
+        if analyzer.matcher.score(words) != legacy:
+            raise AssertionError(f"Score mismatch for {words}")
+        if inverting.label_for_score(inverting.matcher.score(words)) != analyzer.label_for_score(legacy):
+            changed += 1
+    print(f"Equivalence: compiled matcher matches the legacy loop on {samples} samples")
+    print(f"invert_negated_negatives changes the label of {changed}/{samples} samples "
+          f"({100 * changed / samples:.1f}%)")
+
+
+def main(text_length=5000, sizes=(60, 1000, 10000, 50000)):
+    rng = random.Random(42)
+    analyzer = SentimentAnalyzer()
+    check_equivalence(analyzer, SentimentAnalyzer(invert_negated_negatives=True), rng)
+
+    print(f"\nScoring {text_length} tokens (ms per document)")
+    print(f"{'lexicon':>8} {'legacy loop':>12} {'naive phrases':>14} {'compiled':>10} {'compile s':>10}")
+
+    for size in sizes:
+        entries = build_lexicon(rng, size)
+        words = build_text(rng, analyzer, entries, text_length)
+
+        start = time.perf_counter()
+        matcher = LexiconMatcher()
+        matcher.add_entries(entries)
+        compile_seconds = time.perf_counter() - start
+
+        phrases = [(term.split(), value) for term, _, value in entries]
+        repeat = 20
+
+        legacy = timed(lambda: legacy_score(analyzer, words), repeat)
+        compiled = timed(lambda: matcher.score(words), repeat)
+        # The naive scan costs tokens x lexicon size; time a slice and scale it up
+        sample = words[:max(50, text_length * 100 // size)]
+        naive = timed(lambda: naive_phrase_score(phrases, sample), 1) * len(words) / len(sample)
+
+        print(f"{size:>8} {legacy * 1000:>12.2f} {naive * 1000:>14.1f} "
+              f"{compiled * 1000:>10.2f} {compile_seconds:>10.3f}")
+
+    print("\nlegacy loop: built-in single words only (cannot match phrases)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
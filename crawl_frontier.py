@@ -0,0 +1,331 @@
+import sqlite3
+import logging
+import os
+from typing import List, Dict, Optional
+
+# Frontier URL states
+PENDING = 'pending'
+IN_PROGRESS = 'in_progress'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class CrawlFrontier:
+    def __init__(self, db_path=None, max_attempts=3):
+        """
+        Durable queue of discovered article URLs and polled feeds.
+
+        Stored in SQLite (by default next to the analysis tables) so a
+        restarted ingester resumes where it stopped without re-fetching
+        completed work.
+
+        :param db_path: Optional custom path for the database file
+        :param max_attempts: Attempts before a URL is marked failed
+        """
+        if db_path is None:
+            db_path = os.path.join(os.getcwd(), 'article_analysis.db')
+
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+
+        # A bare file name has no directory to create
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.create_tables()
+
+    def _get_connection(self):
+        """
+        Create and return a new database connection.
+
+        :return: SQLite database connection
+        """
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            return conn
+        except sqlite3.Error as e:
+            logging.error(f"Frontier connection error: {e}")
+            return None
+
+    def create_tables(self):
+        """
+        Create the feeds and frontier tables if they don't exist.
+        """
+        conn = self._get_connection()
+        if not conn:
+            return False
+
+        try:
+            cursor = conn.cursor()
+
+            # Polled RSS/Atom feeds and sitemaps with their conditional request state
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS feeds (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                last_seen TEXT,
+                last_polled DATETIME
+            )''')
+
+            # Discovered article URLs waiting for (or done with) analysis
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS frontier (
+                url TEXT PRIMARY KEY,
+                source TEXT,
+                state TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                discovered_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )''')
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_frontier_state
+            ON frontier (state, discovered_at)''')
+
+            conn.commit()
+            return True
+
+        except sqlite3.Error as e:
+            logging.error(f"Frontier setup error: {e}")
+            return False
+        finally:
+            conn.close()
+
+    def add_feed(self, url: str) -> bool:
+        """
+        Register a feed or sitemap to poll (no-op if already registered).
+
+        :param url: Feed or sitemap URL
+        :return: True if the feed was newly added
+        """
+        conn = self._get_connection()
+        if not conn:
+            return False
+        try:
+            cursor = conn.execute('INSERT OR IGNORE INTO feeds (url) VALUES (?)', (url,))
+            conn.commit()
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logging.error(f"Error adding feed {url}: {e}")
+            return False
+        finally:
+            conn.close()
+
+    def get_feeds(self, poll_interval: Optional[int] = None) -> List[Dict]:
+        """
+        Return registered feeds, optionally only those due for polling.
+
+        :param poll_interval: Only return feeds not polled in this many seconds
+        :return: List of feed dictionaries
+        """
+        conn = self._get_connection()
+        if not conn:
+            return []
+        try:
+            if poll_interval is None:
+                rows = conn.execute('SELECT * FROM feeds ORDER BY url')
+            else:
+                rows = conn.execute('''
+                    SELECT * FROM feeds
+                    WHERE last_polled IS NULL
+                       OR last_polled <= datetime('now', ?)
+                    ORDER BY last_polled
+                ''', (f'-{int(poll_interval)} seconds',))
+            return [dict(row) for row in rows]
+        except sqlite3.Error as e:
+            logging.error(f"Error reading feeds: {e}")
+            return []
+        finally:
+            conn.close()
+
+    def update_feed(self, url: str, etag=None, last_modified=None, last_seen=None):
+        """
+        Record a poll of a feed together with its new conditional request state.
+
+        Values left as None keep their previous value.
+
+        :param url: Feed URL
+        :param etag: ETag response header
+        :param last_modified: Last-Modified response header
+        :param last_seen: Newest item timestamp seen in the feed
+        """
+        conn = self._get_connection()
+        if not conn:
+            return
+        try:
+            conn.execute('''
+                UPDATE feeds SET
+                    etag = COALESCE(?, etag),
+                    last_modified = COALESCE(?, last_modified),
+                    last_seen = COALESCE(?, last_seen),
+                    last_polled = CURRENT_TIMESTAMP
+                WHERE url = ?
+            ''', (etag, last_modified, last_seen, url))
+            conn.commit()
+        except sqlite3.Error as e:
+            logging.error(f"Error updating feed {url}: {e}")
+        finally:
+            conn.close()
+
+    def add_urls(self, urls: List[str], source: Optional[str] = None) -> int:
+        """
+        Add discovered URLs to the frontier, ignoring ones already known.
+
+        URLs that already have a stored analysis are recorded as done.
+
+        :param urls: Article URLs
+        :param source: Feed the URLs were discovered in
+        :return: Number of newly queued URLs
+        """
+        if not urls:
+            return 0
+
+        conn = self._get_connection()
+        if not conn:
+            return 0
+        try:
+            has_articles = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles'"
+            ).fetchone()
+
+            before = conn.total_changes
+            conn.executemany(
+                'INSERT OR IGNORE INTO frontier (url, source) VALUES (?, ?)',
+                [(url, source) for url in dict.fromkeys(urls)]
+            )
+            added = conn.total_changes - before
+
+            if has_articles and added:
+                conn.execute(f'''
+                    UPDATE frontier SET state = '{DONE}'
+                    WHERE state = '{PENDING}' AND attempts = 0
+                      AND url IN (SELECT url FROM articles)
+                ''')
+
+            conn.commit()
+            return added
+        except sqlite3.Error as e:
+            logging.error(f"Error adding URLs to frontier: {e}")
+            return 0
+        finally:
+            conn.close()
+
+    def claim(self, limit: int = 50) -> List[str]:
+        """
+        Take up to `limit` pending URLs, oldest first, and mark them in progress.
+
+        :param limit: Maximum number of URLs to claim
+        :return: List of claimed URLs
+        """
+        conn = self._get_connection()
+        if not conn:
+            return []
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            rows = conn.execute(f'''
+                SELECT url FROM frontier
+                WHERE state = '{PENDING}'
+                ORDER BY discovered_at
+                LIMIT ?
+            ''', (limit,)).fetchall()
+            urls = [row['url'] for row in rows]
+
+            conn.executemany(f'''
+                UPDATE frontier
+                SET state = '{IN_PROGRESS}', attempts = attempts + 1,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE url = ?
+            ''', [(url,) for url in urls])
+            conn.commit()
+            return urls
+        except sqlite3.Error as e:
+            logging.error(f"Error claiming frontier URLs: {e}")
+            conn.rollback()
+            return []
+        finally:
+            conn.close()
+
+    def mark_done(self, url: str):
+        """
+        Mark a URL as analyzed and stored.
+
+        :param url: Article URL
+        """
+        self._set_state(url, DONE)
+
+    def mark_failed(self, url: str):
+        """
+        Return a URL to the queue, or mark it failed after max_attempts.
+
+        :param url: Article URL
+        """
+        conn = self._get_connection()
+        if not conn:
+            return
+        try:
+            conn.execute(f'''
+                UPDATE frontier
+                SET state = CASE WHEN attempts >= ? THEN '{FAILED}' ELSE '{PENDING}' END,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE url = ?
+            ''', (self.max_attempts, url))
+            conn.commit()
+        except sqlite3.Error as e:
+            logging.error(f"Error marking {url} failed: {e}")
+        finally:
+            conn.close()
+
+    def _set_state(self, url, state):
+        conn = self._get_connection()
+        if not conn:
+            return
+        try:
+            conn.execute('''
+                UPDATE frontier SET state = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE url = ?
+            ''', (state, url))
+            conn.commit()
+        except sqlite3.Error as e:
+            logging.error(f"Error updating frontier state for {url}: {e}")
+        finally:
+            conn.close()
+
+    def recover(self) -> int:
+        """
+        Return URLs left in progress by a crashed run to the pending queue.
+
+        :return: Number of recovered URLs
+        """
+        conn = self._get_connection()
+        if not conn:
+            return 0
+        try:
+            cursor = conn.execute(f'''
+                UPDATE frontier SET state = '{PENDING}', updated_at = CURRENT_TIMESTAMP
+                WHERE state = '{IN_PROGRESS}'
+            ''')
+            conn.commit()
+            if cursor.rowcount:
+                logging.info(f"Recovered {cursor.rowcount} in-progress frontier URLs")
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logging.error(f"Error recovering frontier: {e}")
+            return 0
+        finally:
+            conn.close()
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Return the number of frontier URLs in each state.
+        """
+        conn = self._get_connection()
+        if not conn:
+            return {}
+        try:
+            rows = conn.execute('SELECT state, COUNT(*) AS n FROM frontier GROUP BY state')
+            return {row['state']: row['n'] for row in rows}
+        except sqlite3.Error as e:
+            logging.error(f"Error counting frontier: {e}")
+            return {}
+        finally:
+            conn.close()
@@ -0,0 +1,525 @@
+import sys
+import time
+import heapq
+import random
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from webscrapping import WebScraper
+
+# Responses worth retrying; 429 and 503 also pause the whole host
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        """
+        Token bucket limiting how often requests may start
+
+        :param rate: Tokens added per second
+        :param capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """
+        Return how many seconds until a token is available (0 if one is now)
+        """
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class HostState:
+    def __init__(self, host, rate, burst, concurrency):
+        """
+        Queue, rate limit and adaptive concurrency for a single host
+
+        :param host: scheme://netloc of the host
+        :param rate: Requests per second allowed to this host
+        :param burst: Token bucket capacity
+        :param concurrency: Initial number of parallel requests
+        """
+        self.host = host
+        self.queue = []  # heap of (not_before, seq, url, attempt)
+        self.bucket = TokenBucket(rate, burst)
+        self.max_rate = rate
+        self.limit = float(concurrency)
+        self.active = 0
+        self.paused_until = 0.0
+        self.latency = None
+        self.min_latency = None
+        self.robots = None
+        self.robots_expires = 0.0
+        self.robots_unavailable = False
+        self.robots_lock = threading.Lock()
+        self.stats = {'requests': 0, 'succeeded': 0, 'failed': 0,
+                      'retried': 0, 'throttled': 0, 'disallowed': 0, 'deferred': 0}
+
+    def summary(self):
+        """
+        Return counters and the current adaptive state of the host
+        """
+        summary = dict(self.stats)
+        summary.update({
+            'concurrency': round(self.limit, 2),
+            'rate': round(self.bucket.rate, 3),
+            'avg_latency': round(self.latency, 3) if self.latency is not None else None
+        })
+        return summary
+
+
+class CrawlScheduler:
+    def __init__(
+        self,
+        scraper=None,
+        max_workers=16,
+        requests_per_second=1.0,
+        burst=2,
+        initial_concurrency=2,
+        max_host_concurrency=8,
+        max_retries=3,
+        backoff_base=1.0,
+        max_backoff=60.0,
+        max_retry_after=3600,
+        respect_robots=True,
+        robots_ttl=86400,
+        robots_retry=300
+    ):
+        """
+        Polite per-host scheduler in front of WebScraper.
+
+        Every host gets its own queue, token bucket and concurrency limit.
+        The limit grows while latency stays near the best seen and shrinks
+        on slow responses, errors and throttling (AIMD). Throttling also
+        halves the host's request rate, which then recovers on success.
+
+        :param scraper: WebScraper used to fetch and parse pages
+        :param max_workers: Maximum number of requests in flight across all hosts
+        :param requests_per_second: Per-host request rate ceiling
+        :param burst: Per-host token bucket capacity
+        :param initial_concurrency: Starting per-host concurrency
+        :param max_host_concurrency: Upper bound on per-host concurrency
+        :param max_retries: Retries for throttled, 5xx and network failures
+        :param backoff_base: Base delay in seconds for exponential backoff
+        :param max_backoff: Maximum computed (exponential) delay in seconds for
+            a single retry; a server's Retry-After is honored as sent
+        :param max_retry_after: Longest Retry-After in seconds worth waiting for;
+            when a host asks for more, its queued URLs fail for this run
+        :param respect_robots: Skip URLs disallowed by robots.txt
+        :param robots_ttl: Seconds a fetched robots.txt stays cached
+        :param robots_retry: Seconds before robots.txt is fetched again after a
+            429, 5xx or network error (the host's URLs wait until then)
+        """
+        self.scraper = scraper or WebScraper()
+        self.max_workers = max_workers
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.initial_concurrency = initial_concurrency
+        self.max_host_concurrency = max_host_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.respect_robots = respect_robots
+        self.robots_ttl = robots_ttl
+        self.robots_retry = robots_retry
+        self.user_agent = self.scraper.headers.get('User-Agent', '*')
+
+        self.hosts = {}
+        self._condition = threading.Condition()
+        self._seq = 0
+        self._pending = 0
+        self._active = 0
+
+    def _host_for(self, url):
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        if key not in self.hosts:
+            self.hosts[key] = HostState(key, self.requests_per_second,
+                                        self.burst, self.initial_concurrency)
+        return self.hosts[key]
+
+    def _push(self, host, url, attempt, not_before=0.0):
+        self._seq += 1
+        heapq.heappush(host.queue, (not_before, self._seq, url, attempt))
+        self._pending += 1
+
+    def add(self, url):
+        """
+        Queue a URL for crawling
+
+        :param url: Absolute http(s) URL
+        """
+        with self._condition:
+            self._push(self._host_for(url), url, 0)
+            self._condition.notify()
+
+    def add_many(self, urls):
+        """
+        Queue several URLs, dropping duplicates
+
+        :param urls: Iterable of absolute http(s) URLs
+        """
+        for url in dict.fromkeys(urls):
+            self.add(url)
+
+    def _load_robots(self, host):
+        """
+        Fetch and cache robots.txt for a host (called from worker threads)
+
+        A missing robots.txt (4xx) allows everything. A throttled (429),
+        failing (5xx) or unreachable one is treated as temporary: the host
+        is considered unavailable and robots.txt is asked for again after
+        robots_retry seconds.
+        """
+        with host.robots_lock:
+            if host.robots is not None and time.monotonic() < host.robots_expires:
+                return
+
+            parser = RobotFileParser()
+            unavailable = False
+            try:
+                response = self.scraper.fetch(f"{host.host}/robots.txt")
+                if response.status_code == 429 or response.status_code >= 500:
+                    logging.warning(f"robots.txt for {host.host} returned HTTP {response.status_code}")
+                    unavailable = True
+                elif response.status_code >= 400:
+                    parser.allow_all = True
+                else:
+                    parser.parse(response.text.splitlines())
+            except requests.RequestException as e:
+                logging.warning(f"Could not fetch robots.txt for {host.host}: {e}")
+                unavailable = True
+
+            if unavailable:
+                parser.disallow_all = True
+
+            # A crawl delay is a hard ceiling on the request rate
+            delay = parser.crawl_delay(self.user_agent)
+            rate = parser.request_rate(self.user_agent)
+            with self._condition:
+                if delay:
+                    host.max_rate = min(host.max_rate, 1.0 / float(delay))
+                if rate:
+                    host.max_rate = min(host.max_rate, rate.requests / rate.seconds)
+                host.bucket.rate = min(host.bucket.rate, host.max_rate)
+
+            host.robots = parser
+            host.robots_unavailable = unavailable
+            host.robots_expires = time.monotonic() + (self.robots_retry if unavailable else self.robots_ttl)
+
+    def _retry_delay(self, response, attempt):
+        """
+        Return the delay before the next attempt, honoring Retry-After
+
+        The server's Retry-After is used as sent; only the computed
+        exponential backoff is capped at max_backoff.
+
+        :param response: Failed response, or None for network errors
+        :param attempt: Number of attempts already made
+        :return: Delay in seconds
+        """
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after).timestamp()
+                    return max(0.0, retry_at - time.time())
+                except (TypeError, ValueError):
+                    pass
+
+        delay = self.backoff_base * (2 ** attempt)
+        return min(self.max_backoff, delay * random.uniform(0.5, 1.5))
+
+    def _adapt(self, host, latency=None, failed=False, throttled=False):
+        """
+        Adjust a host's concurrency limit and rate from the outcome of one request
+        """
+        if throttled:
+            host.limit = max(1.0, host.limit / 2)
+            host.bucket.rate = max(host.max_rate / 20, host.bucket.rate / 2)
+            return
+        if failed:
+            host.limit = max(1.0, host.limit * 0.75)
+            return
+
+        host.latency = latency if host.latency is None else 0.8 * host.latency + 0.2 * latency
+        host.min_latency = latency if host.min_latency is None else min(host.min_latency, latency)
+        host.bucket.rate = min(host.max_rate, host.bucket.rate * 1.05)
+
+        # Rising latency means the server (or our link) is saturating
+        if host.latency > 3 * max(host.min_latency, 0.05):
+            host.limit = max(1.0, host.limit * 0.9)
+        else:
+            host.limit = min(float(self.max_host_concurrency), host.limit + 1.0 / host.limit)
+
+    def _process(self, host, url, attempt, results, callback):
+        """
+        Fetch and parse one URL, then record the outcome (runs in a worker thread)
+        """
+        response = None
+        article = None
+        latency = None
+        error = None
+        disallowed = False
+        deferred = False
+
+        try:
+            if self.respect_robots:
+                self._load_robots(host)
+                if host.robots_unavailable:
+                    deferred = True
+                else:
+                    disallowed = not host.robots.can_fetch(self.user_agent, url)
+
+            if not disallowed and not deferred:
+                start = time.monotonic()
+                response = self.scraper.fetch(url)
+                latency = time.monotonic() - start
+                if response.status_code < 400:
+                    article = self.scraper.parse_article(response.content, url)
+        except Exception as e:
+            error = e
+
+        status = response.status_code if response is not None else None
+        retryable = error is not None or status in RETRY_STATUSES
+        finished = True
+
+        with self._condition:
+            host.active -= 1
+            self._active -= 1
+
+            if disallowed:
+                host.stats['disallowed'] += 1
+                logging.info(f"robots.txt disallows {url}")
+            elif not deferred:
+                host.stats['requests'] += 1
+
+            if deferred:
+                # Wait for the next robots.txt attempt rather than guessing
+                if attempt < self.max_retries:
+                    host.stats['deferred'] += 1
+                    self._push(host, url, attempt + 1, host.robots_expires)
+                    finished = False
+                else:
+                    host.stats['failed'] += 1
+                    logging.error(f"Crawl failed for {url}: robots.txt unavailable")
+            elif article is not None:
+                host.stats['succeeded'] += 1
+                self._adapt(host, latency=latency)
+            elif not disallowed and retryable and attempt < self.max_retries:
+                delay = self._retry_delay(response, attempt)
+                if status in THROTTLE_STATUSES:
+                    host.stats['throttled'] += 1
+                    host.paused_until = max(host.paused_until, time.monotonic() + delay)
+                    self._adapt(host, throttled=True)
+                else:
+                    self._adapt(host, failed=True)
+
+                if delay > self.max_retry_after:
+                    host.stats['failed'] += 1
+                    logging.error(f"Crawl failed for {url}: host asked to wait {delay:.0f}s")
+                else:
+                    host.stats['retried'] += 1
+                    self._push(host, url, attempt + 1, time.monotonic() + delay)
+                    finished = False
+            elif not disallowed:
+                host.stats['failed'] += 1
+                logging.error(f"Crawl failed for {url}: {error or f'HTTP {status}'}")
+
+            if finished:
+                results[url] = article
+            self._condition.notify_all()
+
+        if finished and callback is not None:
+            try:
+                callback(url, article)
+            except Exception as e:
+                logging.error(f"Crawl callback error for {url}: {e}")
+
+    def _give_up(self, host, url, results, callback):
+        """
+        Finish a URL without fetching it because its host is paused for
+        longer than max_retry_after (runs in a worker thread)
+        """
+        with self._condition:
+            self._active -= 1
+            host.stats['failed'] += 1
+            results[url] = None
+            self._condition.notify_all()
+
+        logging.error(f"Crawl failed for {url}: host paused beyond max_retry_after")
+        if callback is not None:
+            try:
+                callback(url, None)
+            except Exception as e:
+                logging.error(f"Crawl callback error for {url}: {e}")
+
+    def is_paused(self, url):
+        """
+        Return True while the URL's host has asked us to wait (throttling
+        or an unavailable robots.txt)
+        """
+        with self._condition:
+            host = self._host_for(url)
+            now = time.monotonic()
+            return host.paused_until > now or (host.robots_unavailable and host.robots_expires > now)
+
+    def fetch_now(self, url, headers=None):
+        """
+        Fetch a single URL outside run(), e.g. a feed or sitemap, under the
+        same robots.txt, rate limit and throttling pause as crawled pages
+
+        Waits for the host's token bucket but not for a throttling pause.
+
+        :param url: Absolute http(s) URL
+        :param headers: Optional extra headers (e.g. conditional request headers)
+        :return: requests.Response, or None if robots.txt disallows the URL
+            or the host is paused
+        """
+        with self._condition:
+            host = self._host_for(url)
+
+        if self.respect_robots:
+            self._load_robots(host)
+            if host.robots_unavailable:
+                logging.info(f"Skipping {url}: robots.txt unavailable")
+                return None
+            if not host.robots.can_fetch(self.user_agent, url):
+                with self._condition:
+                    host.stats['disallowed'] += 1
+                logging.info(f"robots.txt disallows {url}")
+                return None
+
+        while True:
+            with self._condition:
+                now = time.monotonic()
+                if host.paused_until > now:
+                    logging.info(f"Skipping {url}: host paused for {host.paused_until - now:.0f}s")
+                    return None
+                wait = host.bucket.wait_time(now)
+                if wait <= 0:
+                    host.bucket.consume(now)
+                    host.stats['requests'] += 1
+                    break
+            time.sleep(wait)
+
+        response = self.scraper.fetch(url, headers=headers)
+
+        if response.status_code in THROTTLE_STATUSES:
+            delay = self._retry_delay(response, 0)
+            with self._condition:
+                host.stats['throttled'] += 1
+                host.paused_until = max(host.paused_until, time.monotonic() + delay)
+                self._adapt(host, throttled=True)
+        return response
+
+    def _dispatch(self, executor, results, callback):
+        """
+        Start every request that limits allow; caller must hold the condition
+
+        :return: Seconds until the next request could start, or None
+        """
+        now = time.monotonic()
+        next_wake = None
+
+        for host in self.hosts.values():
+            if host.queue and host.paused_until - now > self.max_retry_after:
+                # Not worth waiting for; fail the host's URLs now
+                while host.queue:
+                    _, _, url, _ = heapq.heappop(host.queue)
+                    self._active += 1
+                    self._pending -= 1
+                    executor.submit(self._give_up, host, url, results, callback)
+                continue
+
+            while host.queue and self._active < self.max_workers:
+                if host.active >= int(host.limit):
+                    break
+
+                ready_at = max(host.paused_until, host.queue[0][0])
+                wait = ready_at - now if ready_at > now else host.bucket.wait_time(now)
+                if wait > 0:
+                    next_wake = wait if next_wake is None else min(next_wake, wait)
+                    break
+
+                _, _, url, attempt = heapq.heappop(host.queue)
+                host.bucket.consume(now)
+                host.active += 1
+                self._active += 1
+                self._pending -= 1
+                executor.submit(self._process, host, url, attempt, results, callback)
+
+        return next_wake
+
+    def run(self, urls=None, callback=None):
+        """
+        Crawl every queued URL and block until all have finished
+
+        :param urls: Optional URLs to queue before starting
+        :param callback: Optional callable(url, article) invoked as each URL
+            finishes; article is None when the URL failed or was disallowed
+        :return: Dictionary mapping URL to article dictionary or None
+        """
+        if urls:
+            self.add_many(urls)
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            with self._condition:
+                while self._pending or self._active:
+                    wait = self._dispatch(executor, results, callback)
+                    self._condition.wait(timeout=wait if wait is not None else 1.0)
+
+        return results
+
+    def host_summary(self):
+        """
+        Return per-host counters and adaptive state
+        """
+        with self._condition:
+            return {key: host.summary() for key, host in self.hosts.items()}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python crawl_scheduler.py <file_with_one_url_per_line>")
+        sys.exit(1)
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    with open(sys.argv[1]) as f:
+        urls = [line.strip() for line in f if line.strip()]
+
+    scheduler = CrawlScheduler()
+    start = time.monotonic()
+    results = scheduler.run(urls)
+    elapsed = time.monotonic() - start
+
+    succeeded = sum(1 for article in results.values() if article is not None)
+    print(f"Crawled {succeeded}/{len(results)} URLs in {elapsed:.1f}s")
+    for host, summary in scheduler.host_summary().items():
+        print(f"- {host}: {summary}")
@@ -0,0 +1,242 @@
+import argparse
+import csv
+import json
+import logging
+import os
+import sqlite3
+import sys
+from collections import Counter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Columns exported per table, in output order
+TABLE_COLUMNS = {
+    'articles': ['id', 'url', 'title', 'content', 'analysis_timestamp'],
+    'entities': ['id', 'article_id', 'entity_text', 'entity_type', 'sentiment'],
+    'sentiments': ['id', 'article_id', 'sentiment']
+}
+
+INTEGER_COLUMNS = {'id', 'article_id'}
+
+FORMAT_EXTENSIONS = {'jsonl': 'jsonl', 'csv': 'csv', 'parquet': 'parquet'}
+
+
+class DatabaseStats:
+    def __init__(self):
+        """
+        Running counts and distributions, updated one chunk at a time
+        """
+        self.row_counts = Counter()
+        self.sentiment_distribution = Counter()
+        self.entity_type_distribution = Counter()
+        self.entity_sentiment_distribution = Counter()
+        self.articles_per_day = Counter()
+        self.missing_titles = 0
+        self.missing_content = 0
+        self.content_length_total = 0
+        self.content_length_min = None
+        self.content_length_max = None
+
+    def update(self, table, rows):
+        """
+        Fold a chunk of rows into the statistics
+
+        :param table: Table the rows came from
+        :param rows: List of row tuples in TABLE_COLUMNS order
+        """
+        self.row_counts[table] += len(rows)
+
+        if table == 'articles':
+            for _, _, title, content, timestamp in rows:
+                content = content or ''
+                length = len(content)
+                self.content_length_total += length
+                if self.content_length_min is None or length < self.content_length_min:
+                    self.content_length_min = length
+                if self.content_length_max is None or length > self.content_length_max:
+                    self.content_length_max = length
+                if not title or title == 'No Title Found':
+                    self.missing_titles += 1
+                if not content or content == 'No Content Found':
+                    self.missing_content += 1
+                if timestamp:
+                    self.articles_per_day[str(timestamp)[:10]] += 1
+
+        elif table == 'entities':
+            self.entity_type_distribution.update(row[3] for row in rows)
+            self.entity_sentiment_distribution.update(row[4] for row in rows if len(row) > 4 and row[4])
+
+        elif table == 'sentiments':
+            self.sentiment_distribution.update(row[2] for row in rows)
+
+    def as_dict(self):
+        """
+        Return the statistics as a JSON-serialisable dictionary
+        """
+        articles = self.row_counts['articles']
+        return {
+            'row_counts': dict(self.row_counts),
+            'sentiment_distribution': dict(self.sentiment_distribution),
+            'entity_type_distribution': dict(self.entity_type_distribution),
+            'entity_sentiment_distribution': dict(self.entity_sentiment_distribution),
+            'articles_per_day': dict(sorted(self.articles_per_day.items())),
+            'missing_titles': self.missing_titles,
+            'missing_content': self.missing_content,
+            'content_length': {
+                'min': self.content_length_min,
+                'max': self.content_length_max,
+                'mean': self.content_length_total / articles if articles else None
+            }
+        }
+
+
+def table_columns(conn, table):
+    """
+    Return the exported columns that exist in this database's table
+
+    Databases created before a column was added (e.g. entities.sentiment)
+    are exported without it.
+
+    :param conn: SQLite database connection
+    :param table: Table name (must be a key of TABLE_COLUMNS)
+    :return: List of column names in TABLE_COLUMNS order
+    """
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    return [column for column in TABLE_COLUMNS[table] if column in existing]
+
+
+def iter_chunks(conn, table, chunk_size=1000, stats=None):
+    """
+    Yield rows of a table in fixed-size chunks without loading the table
+
+    :param conn: SQLite database connection
+    :param table: Table name (must be a key of TABLE_COLUMNS)
+    :param chunk_size: Number of rows fetched per chunk
+    :param stats: Optional DatabaseStats updated with every chunk
+    :return: Generator of lists of row tuples
+    """
+    columns = ', '.join(table_columns(conn, table))
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {columns} FROM {table} ORDER BY id")
+
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        if stats is not None:
+            stats.update(table, rows)
+        yield rows
+
+
+def _write_jsonl(chunks, path, columns):
+    with open(path, 'w', encoding='utf-8') as f:
+        for rows in chunks:
+            for row in rows:
+                f.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+                f.write('\n')
+
+
+def _write_csv(chunks, path, columns):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for rows in chunks:
+            writer.writerows(rows)
+
+
+def _write_parquet(chunks, path, columns):
+    schema = pa.schema([
+        (column, pa.int64() if column in INTEGER_COLUMNS else pa.string())
+        for column in columns
+    ])
+    writer = pq.ParquetWriter(path, schema)
+    try:
+        for rows in chunks:
+            arrays = [
+                pa.array([row[i] if column in INTEGER_COLUMNS or row[i] is None else str(row[i])
+                          for row in rows], type=schema.field(column).type)
+                for i, column in enumerate(columns)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+    finally:
+        writer.close()
+
+
+WRITERS = {'jsonl': _write_jsonl, 'csv': _write_csv, 'parquet': _write_parquet}
+
+
+def export_database(db_name='article_analysis.db', output_dir='export', fmt='jsonl',
+                    chunk_size=1000, stats_only=False):
+    """
+    Stream every table to a file and collect statistics in the same pass
+
+    :param db_name: Path to the database file
+    :param output_dir: Directory the exported files are written to
+    :param fmt: Output format: 'jsonl', 'csv' or 'parquet'
+    :param chunk_size: Number of rows held in memory at a time
+    :param stats_only: Only compute statistics, do not write any files
+    :return: Statistics dictionary, or None on error
+    """
+    if fmt not in WRITERS:
+        logging.error(f"Unsupported export format: {fmt}")
+        return None
+    if fmt == 'parquet' and pa is None and not stats_only:
+        logging.error("Parquet export requires pyarrow. Install it or use jsonl/csv.")
+        return None
+    if not os.path.exists(db_name):
+        logging.error(f"Database file {db_name} does not exist!")
+        return None
+
+    conn = None
+    stats = DatabaseStats()
+    try:
+        conn = sqlite3.connect(db_name)
+        if not stats_only:
+            os.makedirs(output_dir, exist_ok=True)
+
+        for table in TABLE_COLUMNS:
+            columns = table_columns(conn, table)
+            chunks = iter_chunks(conn, table, chunk_size=chunk_size, stats=stats)
+
+            if stats_only:
+                for _ in chunks:
+                    pass
+                continue
+
+            path = os.path.join(output_dir, f"{table}.{FORMAT_EXTENSIONS[fmt]}")
+            WRITERS[fmt](chunks, path, columns)
+            logging.info(f"Exported {stats.row_counts[table]} rows from {table} to {path}")
+
+        return stats.as_dict()
+
+    except (sqlite3.Error, OSError) as e:
+        logging.error(f"Database export error: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream the article database to JSONL/CSV/Parquet")
+    parser.add_argument('db_name', nargs='?', default='article_analysis.db')
+    parser.add_argument('--output-dir', default='export')
+    parser.add_argument('--format', dest='fmt', choices=sorted(WRITERS), default='jsonl')
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--stats-only', action='store_true',
+                        help="Only print statistics, do not write export files")
+    args = parser.parse_args()
+
+    result = export_database(args.db_name, args.output_dir, args.fmt,
+                             args.chunk_size, args.stats_only)
+    if result is None:
+        sys.exit(1)
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,181 @@
+import sqlite3
+import logging
+import os
+import sys
+import time
+import argparse
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Child tables that reference articles.id
+CHILD_TABLES = ['entities', 'sentiments']
+
+
+def _database_size(cursor):
+    """
+    Return the allocated size and free space of the database in bytes
+
+    :param cursor: SQLite cursor
+    :return: Tuple of (total bytes, free bytes)
+    """
+    page_size = cursor.execute('PRAGMA page_size').fetchone()[0]
+    page_count = cursor.execute('PRAGMA page_count').fetchone()[0]
+    freelist_count = cursor.execute('PRAGMA freelist_count').fetchone()[0]
+    return page_count * page_size, freelist_count * page_size
+
+
+def cleanup_orphans(conn, chunk_size=500, pause=0.0):
+    """
+    Delete entity and sentiment rows whose article no longer exists.
+
+    Rows are removed in chunks, each in its own short transaction, so the
+    write lock is never held for long and the app can keep inserting.
+
+    :param conn: SQLite database connection
+    :param chunk_size: Maximum number of rows deleted per transaction
+    :param pause: Seconds to sleep between chunks to let other writers in
+    :return: Dictionary of deleted row counts per table
+    """
+    deleted = {}
+    cursor = conn.cursor()
+
+    for table in CHILD_TABLES:
+        deleted[table] = 0
+        last_id = 0
+        while True:
+            # Page by id so each chunk resumes where the previous one stopped;
+            # NOT EXISTS also catches rows with a NULL article_id
+            cursor.execute(f'''
+                SELECT id FROM {table}
+                WHERE id > ?
+                  AND NOT EXISTS (SELECT 1 FROM articles a WHERE a.id = {table}.article_id)
+                ORDER BY id
+                LIMIT ?
+            ''', (last_id, chunk_size))
+            ids = [row[0] for row in cursor.fetchall()]
+            if not ids:
+                break
+
+            cursor.executemany(f'DELETE FROM {table} WHERE id = ?', [(i,) for i in ids])
+            conn.commit()
+
+            deleted[table] += len(ids)
+            last_id = ids[-1]
+            if len(ids) < chunk_size:
+                break
+            if pause:
+                time.sleep(pause)
+
+        logging.info(f"Removed {deleted[table]} orphaned rows from {table}")
+
+    return deleted
+
+
+def incremental_vacuum(conn, pages_per_step=1000, full_vacuum=False):
+    """
+    Return free pages to the filesystem in small steps.
+
+    Databases created before auto_vacuum was enabled can only be switched
+    with a full VACUUM, which locks the whole database while it rebuilds
+    it; that only happens when `full_vacuum` is set.
+
+    :param conn: SQLite database connection
+    :param pages_per_step: Number of free pages released per step
+    :param full_vacuum: Switch a non-incremental database over with a full VACUUM
+    :return: True if free pages were released or the database was rebuilt
+    """
+    cursor = conn.cursor()
+    auto_vacuum = cursor.execute('PRAGMA auto_vacuum').fetchone()[0]
+
+    if auto_vacuum != 2:
+        if not full_vacuum:
+            logging.warning("Incremental auto_vacuum is not enabled on this database; "
+                            "free pages are kept. Run with --full-vacuum once to enable it.")
+            return False
+        logging.info("Switching database to incremental auto_vacuum (full VACUUM)")
+        cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        cursor.execute('VACUUM')
+        return True
+
+    while cursor.execute('PRAGMA freelist_count').fetchone()[0] > 0:
+        cursor.execute(f'PRAGMA incremental_vacuum({int(pages_per_step)})')
+        cursor.fetchall()
+        conn.commit()
+    return True
+
+
+def run_maintenance(db_name='article_analysis.db', chunk_size=500, pause=0.0, full_vacuum=False):
+    """
+    Remove orphaned rows, reclaim free space and refresh planner statistics
+
+    :param db_name: Path to the database file
+    :param chunk_size: Maximum number of orphaned rows deleted per transaction
+    :param pause: Seconds to sleep between delete chunks
+    :param full_vacuum: Allow a one-time full VACUUM to enable incremental vacuum
+    :return: Dictionary describing the work done, or None on error
+    """
+    if not os.path.exists(db_name):
+        logging.error(f"Database file {db_name} does not exist!")
+        return None
+
+    conn = None
+    try:
+        conn = sqlite3.connect(db_name)
+        cursor = conn.cursor()
+
+        size_before, _ = _database_size(cursor)
+
+        deleted = cleanup_orphans(conn, chunk_size=chunk_size, pause=pause)
+        vacuumed = incremental_vacuum(conn, full_vacuum=full_vacuum)
+
+        # Measured before ANALYZE, which adds its own sqlite_stat1 pages
+        size_after, free_after = _database_size(cursor)
+
+        cursor.execute('ANALYZE')
+        conn.commit()
+        logging.info("Planner statistics refreshed")
+
+        report = {
+            'deleted': deleted,
+            'vacuumed': vacuumed,
+            'size_before': size_before,
+            'size_after': size_after,
+            'reclaimed': size_before - size_after,
+            'free_after': free_after
+        }
+        logging.info(f"Maintenance report: {report}")
+        return report
+
+    except sqlite3.Error as e:
+        logging.error(f"Database maintenance error: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Remove orphaned rows and reclaim free space")
+    parser.add_argument('db_name', nargs='?', default='article_analysis.db')
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--pause', type=float, default=0.0, help="Seconds to sleep between delete chunks")
+    parser.add_argument('--full-vacuum', action='store_true',
+                        help="Run a one-time full VACUUM (locks the database) to enable incremental vacuum")
+    args = parser.parse_args()
+    db_name = args.db_name
+
+    print(f"Running maintenance on {db_name}...")
+    report = run_maintenance(db_name, args.chunk_size, args.pause, args.full_vacuum)
+
+    if report is None:
+        print("Maintenance failed. Check the log for details.")
+        sys.exit(1)
+
+    for table, count in report['deleted'].items():
+        print(f"Orphaned {table} removed: {count}")
+    print(f"Size before: {report['size_before']} bytes")
+    print(f"Size after: {report['size_after']} bytes")
+    print(f"Reclaimed: {report['reclaimed']} bytes")
+    if not report['vacuumed']:
+        print("Incremental vacuum is not enabled; run with --full-vacuum once to enable it.")
@@ -7,33 +7,34 @@ logging.basicConfig(level=logging.DEBUG,
 def verify_database(db_name='article_analysis.db'):
     """
     Comprehensive database verification script
+
+    For exports and distributions at scale use database_export.py
     """
+    conn = None
     try:
         # Connection to the database
         conn = sqlite3.connect(db_name)
         cursor = conn.cursor()
 
-        # Check articles table
-        cursor.execute("SELECT * FROM articles")
-        articles = cursor.fetchall()
-        logging.info(f"Total articles: {len(articles)}")
+        # Check articles table (counted in SQL, rows streamed from the cursor)
+        cursor.execute("SELECT COUNT(*) FROM articles")
+        article_count = cursor.fetchone()[0]
+        logging.info(f"Total articles: {article_count}")
 
-        if articles:
-            # Print details of first article
-            for article in articles:
-                logging.info(f"Article Details: {article}")
+        if article_count:
+            # Print details of each article without loading the whole table
+            for article in conn.execute("SELECT * FROM articles"):
+                logging.debug(f"Article Details: {article}")
         else:
             logging.warning("No articles found in the database")
 
         # Check entities table
-        cursor.execute("SELECT * FROM entities")
-        entities = cursor.fetchall()
-        logging.info(f"Total entities: {len(entities)}")
+        cursor.execute("SELECT COUNT(*) FROM entities")
+        logging.info(f"Total entities: {cursor.fetchone()[0]}")
 
         # Check sentiments table
-        cursor.execute("SELECT * FROM sentiments")
-        sentiments = cursor.fetchall()
-        logging.info(f"Total sentiments: {len(sentiments)}")
+        cursor.execute("SELECT COUNT(*) FROM sentiments")
+        logging.info(f"Total sentiments: {cursor.fetchone()[0]}")
 
     except sqlite3.Error as e:
         logging.error(f"Database error: {e}")
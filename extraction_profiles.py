@@ -0,0 +1,262 @@
+import os
+import sys
+import json
+import argparse
+import atexit
+import logging
+import threading
+from urllib.parse import urlsplit
+
+# Environment variable naming the profiles file that default WebScrapers share
+PROFILES_ENV = 'EXTRACTION_PROFILES'
+
+# Consecutive fallbacks to the same strategy before it replaces an established one
+SWITCH_AFTER = 3
+
+# One instance per file, so scrapers in the same process do not overwrite each other
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def domain_of(url):
+    """
+    Return the profile key for a URL (host without a leading www.)
+
+    :param url: Page URL
+    :return: Lowercase domain, or None if the URL has no host
+    """
+    if not url:
+        return None
+    host = urlsplit(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host or None
+
+
+class ExtractionProfiles:
+    def __init__(self, path=None, save_every=20):
+        """
+        Per-domain record of which title and content strategies worked.
+
+        With a path, profiles are kept in a JSON file so they survive
+        restarts and can be inspected (python extraction_profiles.py [path]);
+        without one they only live in memory. Use shared() rather than this
+        constructor when several scrapers may use the same file.
+
+        :param path: Optional path for the profiles file (None: memory only)
+        :param save_every: Write the file after this many updates
+        """
+        self.path = path
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.profiles = self._load() if path else {}
+
+        if path:
+            atexit.register(self.save)
+
+    @classmethod
+    def shared(cls, path):
+        """
+        Return the process-wide instance for a profiles file, creating it once
+
+        :param path: Path for the profiles file
+        :return: ExtractionProfiles
+        """
+        key = os.path.abspath(path)
+        with _shared_lock:
+            if key not in _shared:
+                _shared[key] = cls(key)
+            return _shared[key]
+
+    @classmethod
+    def default(cls):
+        """
+        Return the shared profiles named by $EXTRACTION_PROFILES, or a new
+        in-memory instance when it is not set
+        """
+        path = os.environ.get(PROFILES_ENV)
+        return cls.shared(path) if path else cls()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable extraction profiles {self.path}: {e}")
+            return {}
+
+    def save(self):
+        """
+        Write the profiles file atomically if anything changed
+        """
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            data = json.dumps(self.profiles, indent=2, sort_keys=True)
+            self._dirty = 0
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.error(f"Could not save extraction profiles: {e}")
+
+    def strategy(self, domain, kind):
+        """
+        Return the learned strategy for a domain, or None
+
+        :param domain: Domain from domain_of()
+        :param kind: 'title' or 'content'
+        """
+        if domain is None:
+            return None
+        with self._lock:
+            return self.profiles.get(domain, {}).get(kind, {}).get('strategy')
+
+    def average_yield(self, domain, kind):
+        """
+        Return the running average number of characters the strategy extracted
+        """
+        if domain is None:
+            return None
+        with self._lock:
+            return self.profiles.get(domain, {}).get(kind, {}).get('avg_yield')
+
+    def record(self, domain, kind, strategy, extracted_chars, fell_back):
+        """
+        Record the outcome of one extraction
+
+        A fallback strategy is learned straight away while the domain has no
+        strategy that has worked yet; an established strategy is only
+        replaced after SWITCH_AFTER consecutive fallbacks to the same one.
+
+        :param domain: Domain from domain_of()
+        :param kind: 'title' or 'content'
+        :param strategy: Strategy that produced the result (None if all failed
+            or the result should not be learned)
+        :param extracted_chars: Length of the extracted text
+        :param fell_back: True if the learned strategy was not used or failed
+        """
+        if domain is None:
+            return
+
+        with self._lock:
+            profile = self.profiles.setdefault(domain, {}).setdefault(kind, {
+                'strategy': None, 'hits': 0, 'fallbacks': 0, 'avg_yield': None
+            })
+            # Files written before switching was deferred lack these
+            profile.setdefault('candidate', None)
+            profile.setdefault('streak', 0)
+
+            if not fell_back:
+                profile['hits'] += 1
+                profile['candidate'], profile['streak'] = None, 0
+                self._update_yield(profile, extracted_chars)
+            else:
+                # A None strategy only counts the fallback; the learned strategy
+                # and its yield average are left alone
+                profile['fallbacks'] += 1
+                if strategy is None:
+                    profile['candidate'], profile['streak'] = None, 0
+                else:
+                    if profile['candidate'] == strategy:
+                        profile['streak'] += 1
+                    else:
+                        profile['candidate'], profile['streak'] = strategy, 1
+
+                    if (profile['strategy'] is None or profile['hits'] == 0
+                            or profile['streak'] >= SWITCH_AFTER):
+                        if profile['strategy'] != strategy:
+                            # A new strategy starts new hit and yield counts
+                            profile['strategy'] = strategy
+                            profile['hits'] = 0
+                            profile['avg_yield'] = None
+                            self._dirty += self.save_every
+                        profile['candidate'], profile['streak'] = None, 0
+                        self._update_yield(profile, extracted_chars)
+
+            self._dirty += 1
+            should_save = self._dirty >= self.save_every
+
+        if should_save:
+            self.save()
+
+    @staticmethod
+    def _update_yield(profile, extracted_chars):
+        previous = profile['avg_yield']
+        profile['avg_yield'] = (
+            float(extracted_chars) if previous is None
+            else round(0.9 * previous + 0.1 * extracted_chars, 1)
+        )
+
+
+def _sample_page(layout, i):
+    """
+    Build one page of a synthetic site for check_consistency
+    """
+    head = f"<title>Headline {i} | Site</title>"
+    if layout == 'article':
+        head += f'<meta property="og:title" content="Headline {i}">'
+        body = (f'<div class="article-body"><p>Para one of {i}.</p><p>Para two of {i}.</p></div>'
+                '<div class="footer"><p>Cookie banner</p></div>')
+    elif layout == 'live':
+        # Live blogs have neither og:title nor an article body
+        body = f'<div class="live"><p>Update {i}.</p><p>Earlier update.</p></div><p>Cookie banner</p>'
+    else:
+        head += f'<meta property="og:title" content="Feature {i}">'
+        body = f'<div class="content"><p>Feature text {i}.</p></div><p>Cookie banner</p>'
+    return f"<html><head>{head}</head><body>{body}</body></html>".encode('utf-8')
+
+
+def check_consistency(layouts=None):
+    """
+    A profiled scraper must extract the same title and text as one without
+    profiles on a site that mixes page layouts
+
+    :param layouts: Sequence of 'article', 'live' and 'feature' pages
+    :return: Number of pages whose output differed
+    """
+    from webscrapping import WebScraper
+
+    if layouts is None:
+        layouts = (['article'] * 5 + ['live'] + ['article'] * 3 + ['live'] * 4
+                   + ['article', 'feature', 'article', 'feature'] + ['article'] * 5)
+
+    profiled = WebScraper(profiles=ExtractionProfiles())
+    plain = WebScraper(profiles=False)
+
+    mismatches = 0
+    for i, layout in enumerate(layouts):
+        html = _sample_page(layout, i)
+        url = f"https://www.example.com/{layout}/{i}"
+        expected = plain.parse_article(html, url)
+        actual = profiled.parse_article(html, url)
+        if actual != expected:
+            mismatches += 1
+            print(f"Page {i} ({layout}): {actual} != {expected}")
+
+    print(f"Consistency: {len(layouts) - mismatches}/{len(layouts)} pages match the unprofiled scraper")
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect learned extraction profiles")
+    parser.add_argument('path', nargs='?', default=os.environ.get(PROFILES_ENV, 'extraction_profiles.json'))
+    parser.add_argument('--check', action='store_true',
+                        help="Check that profiles do not change extraction results on mixed layouts")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(1 if check_consistency() else 0)
+
+    profiles = ExtractionProfiles(args.path)
+    if not profiles.profiles:
+        print(f"No extraction profiles in {profiles.path}")
+    for domain, profile in sorted(profiles.profiles.items()):
+        print(domain)
+        for kind, entry in sorted(profile.items()):
+            print(f"  {kind}: {entry['strategy']} (hits {entry['hits']}, "
+                  f"fallbacks {entry['fallbacks']}, avg yield {entry['avg_yield']})")
@@ -0,0 +1,283 @@
+import gzip
+import time
+import logging
+import argparse
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from app import ArticleAnalysisApp
+from crawl_frontier import CrawlFrontier
+from crawl_scheduler import CrawlScheduler, THROTTLE_STATUSES
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    filename='article_analysis.log',
+    filemode='a'
+)
+
+
+def _local_name(tag):
+    """
+    Strip the XML namespace from a tag name
+    """
+    return tag.rsplit('}', 1)[-1] if '}' in tag else tag
+
+
+def _child_text(element, *names):
+    """
+    Return the text of the first child whose local name is in `names`
+    """
+    for child in element:
+        if _local_name(child.tag) in names and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def _normalize_date(value):
+    """
+    Convert an RFC 822 or ISO 8601 date to a sortable UTC string
+
+    :param value: Date string from a feed or sitemap
+    :return: 'YYYY-MM-DDTHH:MM:SS' in UTC, or None if unparsable
+    """
+    if not value:
+        return None
+
+    parsed = None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def parse_feed(content):
+    """
+    Extract article links from an RSS/Atom feed, sitemap or sitemap index
+
+    :param content: Raw XML (optionally gzip-compressed)
+    :return: Tuple of (list of (url, date) items, list of child sitemap URLs)
+    """
+    if content[:2] == b'\x1f\x8b':
+        content = gzip.decompress(content)
+
+    root = ET.fromstring(content)
+    kind = _local_name(root.tag)
+    items = []
+    children = []
+
+    if kind in ('rss', 'RDF'):
+        for item in root.iter():
+            if _local_name(item.tag) != 'item':
+                continue
+            link = _child_text(item, 'link') or item.get('{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about')
+            date = _child_text(item, 'pubDate', 'date', 'published', 'updated')
+            if link:
+                items.append((link, _normalize_date(date)))
+
+    elif kind == 'feed':
+        for entry in root:
+            if _local_name(entry.tag) != 'entry':
+                continue
+            link = None
+            for child in entry:
+                if _local_name(child.tag) == 'link' and child.get('rel', 'alternate') == 'alternate':
+                    link = child.get('href')
+                    break
+            date = _child_text(entry, 'published', 'updated')
+            if link:
+                items.append((link, _normalize_date(date)))
+
+    elif kind == 'urlset':
+        for url in root:
+            loc = _child_text(url, 'loc')
+            date = _child_text(url, 'lastmod')
+            for child in url:
+                # Google News sitemaps carry the date in news:news/news:publication_date
+                if _local_name(child.tag) == 'news':
+                    date = _child_text(child, 'publication_date') or date
+            if loc:
+                items.append((loc, _normalize_date(date)))
+
+    elif kind == 'sitemapindex':
+        for sitemap in root:
+            loc = _child_text(sitemap, 'loc')
+            if loc:
+                children.append(loc)
+
+    else:
+        logging.warning(f"Unrecognised feed format: {kind}")
+
+    return items, children
+
+
+class FeedIngester:
+    def __init__(self, app, frontier=None, scheduler=None, poll_interval=300, batch_size=50):
+        """
+        Poll feeds and sitemaps into the frontier and analyze what they discover.
+
+        :param app: ArticleAnalysisApp used to analyze and store articles
+        :param frontier: CrawlFrontier (default: stored next to the app's database)
+        :param scheduler: CrawlScheduler used to fetch articles politely
+        :param poll_interval: Seconds between polls of the same feed
+        :param batch_size: Number of frontier URLs claimed at a time
+        """
+        self.app = app
+        self.frontier = frontier or CrawlFrontier(app.database.db_path)
+        self.scheduler = scheduler or CrawlScheduler(scraper=app.web_scraper)
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+
+    def poll_feed(self, feed):
+        """
+        Conditionally fetch one feed and queue the items newer than last seen
+
+        The fetch goes through the scheduler, so feeds share robots.txt, the
+        rate limit and any Retry-After pause with the host's articles. A
+        throttled feed stays due and is polled again once the pause is over.
+
+        :param feed: Feed dictionary from CrawlFrontier.get_feeds
+        :return: Number of newly queued URLs
+        """
+        headers = {}
+        if feed['etag']:
+            headers['If-None-Match'] = feed['etag']
+        if feed['last_modified']:
+            headers['If-Modified-Since'] = feed['last_modified']
+
+        try:
+            response = self.scheduler.fetch_now(feed['url'], headers=headers)
+        except Exception as e:
+            logging.error(f"Feed fetch error for {feed['url']}: {e}")
+            return 0
+
+        if response is None or response.status_code in THROTTLE_STATUSES:
+            # Disallowed feeds wait for the next interval; paused hosts are retried once free
+            if not self.scheduler.is_paused(feed['url']):
+                self.frontier.update_feed(feed['url'])
+            return 0
+        if response.status_code == 304:
+            self.frontier.update_feed(feed['url'])
+            return 0
+        if response.status_code >= 400:
+            logging.error(f"Feed {feed['url']} returned HTTP {response.status_code}")
+            self.frontier.update_feed(feed['url'])
+            return 0
+
+        try:
+            items, children = parse_feed(response.content)
+        except (ET.ParseError, OSError) as e:
+            logging.error(f"Feed parse error for {feed['url']}: {e}")
+            self.frontier.update_feed(feed['url'])
+            return 0
+
+        for child in children:
+            if self.frontier.add_feed(child):
+                logging.info(f"Discovered sitemap {child} in {feed['url']}")
+
+        # Items older than the newest one seen last time were queued already
+        last_seen = feed['last_seen']
+        new_urls = [url for url, date in items if not (date and last_seen and date < last_seen)]
+        dates = [date for _, date in items if date]
+        newest = max(dates + ([last_seen] if last_seen else []), default=None)
+
+        added = self.frontier.add_urls(new_urls, source=feed['url'])
+        self.frontier.update_feed(
+            feed['url'],
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            last_seen=newest
+        )
+        logging.info(f"Polled {feed['url']}: {len(items)} items, {added} new")
+        return added
+
+    def poll_due_feeds(self):
+        """
+        Poll every feed not polled within poll_interval
+
+        :return: Number of newly queued URLs
+        """
+        return sum(self.poll_feed(feed) for feed in self.frontier.get_feeds(self.poll_interval))
+
+    def _on_article(self, url, article):
+        """
+        Scheduler callback: store the analysis and settle the frontier entry
+        """
+        if article is None:
+            self.frontier.mark_failed(url)
+            return
+
+        try:
+            article_id = self.app.store_article_analysis(url, article)
+        except Exception as e:
+            logging.error(f"Analysis error for {url}: {e}")
+            article_id = None
+
+        if article_id is None:
+            self.frontier.mark_failed(url)
+        else:
+            self.frontier.mark_done(url)
+
+    def process_pending(self):
+        """
+        Crawl and analyze frontier URLs in batches until none are pending
+
+        :return: Number of URLs processed
+        """
+        processed = 0
+        while True:
+            urls = self.frontier.claim(self.batch_size)
+            if not urls:
+                return processed
+            self.scheduler.run(urls, callback=self._on_article)
+            processed += len(urls)
+
+    def run(self, once=False):
+        """
+        Poll and process forever, or a single round when `once` is set
+
+        :param once: Stop after one poll and once the frontier is drained
+        """
+        self.frontier.recover()
+
+        while True:
+            self.poll_due_feeds()
+            processed = self.process_pending()
+            logging.info(f"Processed {processed} URLs, frontier: {self.frontier.counts()}")
+
+            if once:
+                return
+            time.sleep(min(self.poll_interval, 60))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest articles from RSS/Atom feeds and sitemaps")
+    parser.add_argument('feeds_file', nargs='?',
+                        help="File with one feed or sitemap URL per line (added to the stored feeds)")
+    parser.add_argument('--interval', type=int, default=300, help="Seconds between polls of a feed")
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--once', action='store_true', help="Poll once, drain the frontier and exit")
+    parser.add_argument('--lexicon', help="Sentiment lexicon file (default: $SENTIMENT_LEXICON)")
+    parser.add_argument('--profiles', help="Extraction profiles file (default: $EXTRACTION_PROFILES, "
+                                           "else extraction_profiles.json next to the database)")
+    args = parser.parse_args()
+
+    app = ArticleAnalysisApp(profiles_path=args.profiles, lexicon_path=args.lexicon)
+    ingester = FeedIngester(app, poll_interval=args.interval, batch_size=args.batch_size)
+
+    if args.feeds_file:
+        with open(args.feeds_file) as f:
+            for line in f:
+                if line.strip():
+                    ingester.frontier.add_feed(line.strip())
+
+    ingester.run(once=args.once)
+    print(f"Frontier: {ingester.frontier.counts()}")
@@ -0,0 +1,463 @@
+import os
+import time
+import random
+import asyncio
+import itertools
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class StandInServer:
+    def __init__(self, pages, latency=0.05, jitter=0.0, error_rate=0.0, throttle_rate=0.0):
+        """
+        Local HTTP server replaying recorded article pages.
+
+        /page/<n> serves corpus page n (query strings are ignored, so
+        /page/3?v=17 is a distinct URL for the app but the same page).
+
+        :param pages: List of HTML pages (bytes)
+        :param latency: Seconds added to every response
+        :param jitter: Maximum extra random latency in seconds
+        :param error_rate: Fraction of responses turned into HTTP 500
+        :param throttle_rate: Fraction of responses turned into HTTP 429
+        """
+        self.pages = pages
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.served = 0
+        self.injected = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._variants = itertools.count()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                time.sleep(server.latency + random.uniform(0, server.jitter))
+
+                path = self.path.split('?', 1)[0]
+                try:
+                    page = server.pages[int(path.rsplit('/', 1)[-1]) % len(server.pages)]
+                except ValueError:
+                    page = None
+
+                roll = random.random()
+                if page is None:
+                    status = 404
+                elif roll < server.error_rate:
+                    status = 500
+                elif roll < server.error_rate + server.throttle_rate:
+                    status = 429
+                else:
+                    status = 200
+
+                with server._lock:
+                    server.served += 1
+                    if status in (500, 429):
+                        server.injected += 1
+                    if status == 429:
+                        server.throttled += 1
+
+                self.send_response(status)
+                if status == 429:
+                    self.send_header('Retry-After', '1')
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                body = page if status == 200 else b''
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def start(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def url_for(self, index):
+        """
+        Return a URL for corpus page `index` that no earlier call returned
+        """
+        variant = next(self._variants)
+        return f"http://127.0.0.1:{self._server.server_address[1]}/page/{index}?v={variant}"
+
+
+def synthetic_corpus(count=50, seed=7):
+    """
+    Generate article-like pages when no recorded corpus is available
+    """
+    rng = random.Random(seed)
+    names = ['Reuters', 'Apple', 'Microsoft', 'Angela Merkel', 'Joe Biden', 'the United Nations',
+             'Goldman Sachs', 'Elon Musk', 'the European Central Bank', 'Tesla']
+    words = ['markets', 'growth', 'good', 'bad', 'record', 'high', 'loss', 'success', 'crisis',
+             'very', 'not', 'problem', 'excellent', 'report', 'said', 'announced', 'on', 'Monday']
+
+    pages = []
+    for i in range(count):
+        paragraphs = []
+        for _ in range(rng.randint(5, 25)):
+            sentence = ' '.join(rng.choice(words) for _ in range(rng.randint(8, 20)))
+            paragraphs.append(f"<p>{rng.choice(names)} {sentence}.</p>")
+        pages.append(
+            f"<html><head><title>Synthetic article {i}</title>"
+            f"<meta property=\"og:title\" content=\"Synthetic article {i}\"></head>"
+            f"<body><article>{''.join(paragraphs)}</article></body></html>".encode('utf-8')
+        )
+    return pages
+
+
+def load_corpus(corpus_dir):
+    """
+    Load recorded pages (*.html) from a directory, in name order
+
+    :param corpus_dir: Directory written by --record, or None for a synthetic corpus
+    :return: List of HTML pages (bytes)
+    """
+    if not corpus_dir:
+        return synthetic_corpus()
+
+    pages = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith('.html'):
+            with open(os.path.join(corpus_dir, name), 'rb') as f:
+                pages.append(f.read())
+    if not pages:
+        raise SystemExit(f"No .html pages found in {corpus_dir}")
+    return pages
+
+
+def record_corpus(urls_file, corpus_dir):
+    """
+    Fetch live article pages once and save them for offline replay
+
+    :param urls_file: File with one URL per line
+    :param corpus_dir: Directory the pages are written to
+    """
+    from webscrapping import WebScraper
+
+    scraper = WebScraper(profiles=False)
+    os.makedirs(corpus_dir, exist_ok=True)
+
+    with open(urls_file) as f:
+        urls = [line.strip() for line in f if line.strip()]
+
+    saved = 0
+    for i, url in enumerate(urls):
+        try:
+            response = scraper.fetch(url)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Skipping {url}: {e}")
+            continue
+        with open(os.path.join(corpus_dir, f"{i:05d}.html"), 'wb') as f:
+            f.write(response.content)
+        saved += 1
+
+    print(f"Recorded {saved}/{len(urls)} pages to {corpus_dir}")
+
+
+def rss_mb():
+    """
+    Return the current resident set size of this process in MB, if available
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class RssSampler:
+    def __init__(self, interval=0.05):
+        """
+        Background thread tracking the peak RSS between start() and stop().
+
+        The process-lifetime peak (ru_maxrss) never goes down, so it cannot
+        tell the runs of a sweep apart.
+
+        :param interval: Seconds between samples
+        """
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        current = rss_mb()
+        if current is not None and (self.peak is None or current > self.peak):
+            self.peak = current
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return self.peak
+
+
+def make_target(name, api_url=None, db_path=None, profiles_path=None):
+    """
+    Build the entry point under test
+
+    :param name: 'app' (ArticleAnalysisApp.analyze_article), 'gradio' (the
+        streaming Gradio handler, called directly without the Gradio queue)
+        or 'api' (POST /analyze on a running api.py)
+    :param api_url: Base URL of the JSON API for the 'api' target
+    :param db_path: Database used by in-process targets
+    :param profiles_path: Extraction profiles file used by in-process targets
+    :return: Callable(url) returning True on success
+    """
+    if name == 'api':
+        # Sessions are not thread-safe; give each client thread its own
+        local = threading.local()
+
+        def call_api(url):
+            if not hasattr(local, 'session'):
+                local.session = requests.Session()
+            response = local.session.post(f"{api_url}/analyze", json={'url': url}, timeout=120)
+            return response.status_code == 200
+
+        return call_api
+
+    from app import ArticleAnalysisApp, create_gradio_interface
+
+    app = ArticleAnalysisApp(db_path, profiles_path=profiles_path)
+
+    if name == 'app':
+        return lambda url: 'Error' not in app.analyze_article(url)
+
+    handler = create_gradio_interface(app).fn
+
+    async def consume(url):
+        outputs = None
+        async for outputs in handler(url):
+            pass
+        return outputs
+
+    def call_gradio(url):
+        outputs = asyncio.run(consume(url))
+        return bool(outputs and outputs[3])
+
+    return call_gradio
+
+
+def run_scheduler_load(server, corpus_size, max_workers=8, total_requests=200, requests_per_second=20.0):
+    """
+    Crawl stand-in pages through CrawlScheduler and report how it copes with throttling
+
+    The stand-in is a single host, so this exercises one host's token
+    bucket, AIMD concurrency and Retry-After handling.
+
+    :param max_workers: Scheduler worker threads (also the per-host concurrency ceiling)
+    :param requests_per_second: Per-host request rate ceiling
+    :return: Dictionary with throughput, upstream 429s and the host's adaptive state
+    """
+    from crawl_scheduler import CrawlScheduler
+    from webscrapping import WebScraper
+
+    scheduler = CrawlScheduler(
+        scraper=WebScraper(profiles=False),
+        max_workers=max_workers,
+        requests_per_second=requests_per_second,
+        burst=max_workers,
+        max_host_concurrency=max_workers,
+        backoff_base=0.5
+    )
+    urls = [server.url_for(i % corpus_size) for i in range(total_requests)]
+
+    start = time.perf_counter()
+    results = scheduler.run(urls)
+    duration = time.perf_counter() - start
+
+    succeeded = sum(1 for article in results.values() if article is not None)
+    host = next(iter(scheduler.host_summary().values()), {})
+    return {
+        'workers': max_workers,
+        'urls': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'duration_s': round(duration, 2),
+        'throughput_rps': round(succeeded / duration, 2) if duration else None,
+        'upstream_requests': server.served,
+        'upstream_429': server.throttled,
+        'injected_errors': server.injected,
+        'retried': host.get('retried'),
+        'final_concurrency': host.get('concurrency'),
+        'final_rate': host.get('rate')
+    }
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_load(target, server, corpus_size, clients=8, total_requests=200, cache_hit_ratio=0.5, seed=1):
+    """
+    Drive the target with concurrent clients and collect latencies
+
+    A request repeats an already analyzed URL with probability
+    cache_hit_ratio, otherwise it asks for a URL the app has never seen.
+
+    :return: Dictionary with throughput, latency percentiles, errors and the
+        peak RSS during this run
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    seen_urls = []
+    seen = set()
+    latencies = []
+    counters = {'issued': 0, 'succeeded': 0, 'failed': 0, 'repeat_requests': 0}
+
+    def next_url():
+        with lock:
+            if counters['issued'] >= total_requests:
+                return None
+            counters['issued'] += 1
+            if seen_urls and rng.random() < cache_hit_ratio:
+                counters['repeat_requests'] += 1
+                return rng.choice(seen_urls)
+            return server.url_for(rng.randrange(corpus_size))
+
+    def client():
+        while True:
+            url = next_url()
+            if url is None:
+                return
+
+            start = time.perf_counter()
+            try:
+                ok = target(url)
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - start
+
+            with lock:
+                latencies.append(elapsed)
+                counters['succeeded' if ok else 'failed'] += 1
+                if ok and url not in seen:
+                    seen.add(url)
+                    seen_urls.append(url)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    sampler = RssSampler().start()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - start
+    peak_rss = sampler.stop()
+
+    latencies.sort()
+    return {
+        'clients': clients,
+        'requests': len(latencies),
+        'succeeded': counters['succeeded'],
+        'failed': counters['failed'],
+        'repeat_requests': counters['repeat_requests'],
+        'duration_s': round(duration, 2),
+        'throughput_rps': round(len(latencies) / duration, 2) if duration else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 1) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 1) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1) if latencies else None,
+        'upstream_requests': server.served,
+        'injected_errors': server.injected,
+        'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test against a local stand-in for news sites")
+    parser.add_argument('--target', choices=['app', 'gradio', 'api', 'scheduler'], default='app',
+                        help="'scheduler' crawls through CrawlScheduler (--clients sets its workers)")
+    parser.add_argument('--api-url', default='http://127.0.0.1:8000',
+                        help="Base URL of a running api.py (target 'api'; peak RSS is then the client's)")
+    parser.add_argument('--corpus', help="Directory of recorded .html pages (default: synthetic pages)")
+    parser.add_argument('--record', metavar='URLS_FILE',
+                        help="Record the pages listed in URLS_FILE into --corpus and exit")
+    parser.add_argument('--clients', type=int, nargs='+', default=[8],
+                        help="Concurrent clients; several values run a sweep to find saturation")
+    parser.add_argument('--requests', type=int, default=200, help="Requests per run")
+    parser.add_argument('--cache-hit-ratio', type=float, default=0.5)
+    parser.add_argument('--latency', type=float, default=0.05, help="Stand-in response latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--rate', type=float, default=20.0,
+                        help="Per-host requests per second for the 'scheduler' target")
+    args = parser.parse_args()
+
+    if args.record:
+        if not args.corpus:
+            parser.error("--record requires --corpus")
+        record_corpus(args.record, args.corpus)
+        return
+
+    pages = load_corpus(args.corpus)
+    server = StandInServer(pages, args.latency, args.jitter, args.error_rate, args.throttle_rate).start()
+
+    if args.target == 'scheduler':
+        print(f"Target: scheduler, corpus: {len(pages)} pages, throttle rate: {args.throttle_rate}")
+        try:
+            for clients in args.clients:
+                server.served = server.injected = server.throttled = 0
+                print(run_scheduler_load(server, len(pages), clients, args.requests, args.rate))
+        finally:
+            server.stop()
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Fresh database and extraction profiles, so runs start cold and leave no files behind
+        target = make_target(args.target, args.api_url, os.path.join(tmp, 'load_test.db'),
+                             os.path.join(tmp, 'extraction_profiles.json'))
+        print(f"Target: {args.target}, corpus: {len(pages)} pages, "
+              f"cache-hit ratio: {args.cache_hit_ratio}")
+
+        try:
+            for clients in args.clients:
+                server.served = server.injected = 0
+                result = run_load(target, server, len(pages), clients, args.requests, args.cache_hit_ratio)
+                print(result)
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
+import os
 import sys
 from webscrapping import WebScraper
 from name_entity import EntityExtractor
 from sentiment_analysis import SentimentAnalyzer
+from article_analyzer import ArticleAnalyzer
 
 def analyze_article(url):
     """
@@ -10,8 +12,7 @@ def analyze_article(url):
     :param url: URL of the article to analyze
     """
     web_scraper = WebScraper()
-    entity_extractor = EntityExtractor()
-    sentiment_analyzer = SentimentAnalyzer()
+    article_analyzer = ArticleAnalyzer(EntityExtractor(), SentimentAnalyzer(os.environ.get('SENTIMENT_LEXICON')))
 
     # Scrape article
     article = web_scraper.scrape_article(url)
@@ -28,20 +29,21 @@ def analyze_article(url):
     print("\n--- Scraped Article Content ---")
     print(article['text'][:1000] + "..." if len(article['text']) > 1000 else article['text'])
 
-    # Extract named entities
+    # Extract named entities and sentiment in a single pass
+    analysis = article_analyzer.analyze(article['text'])
+
     print("\n--- Named Entities ---")
-    entities = entity_extractor.extract_entities(article['text'])
+    entities = analysis['entities']
     if entities:
         print("Persons and Organizations:")
         for entity in entities:
-            print(f"- {entity['text']} (Type: {entity['label']})")
+            print(f"- {entity['text']} (Type: {entity['label']}, Sentiment: {entity['sentiment']})")
     else:
         print("No named entities found.")
 
     # Perform sentiment analysis
     print("\n--- Sentiment Analysis ---")
-    sentiment = sentiment_analyzer.analyze_sentiment(article['text'])
-    print(f"Overall Sentiment: {sentiment}")
+    print(f"Overall Sentiment: {analysis['sentiment']}")
 
 def main():
     # Check if URL is provided
@@ -7,6 +7,9 @@ class EntityExtractor:
         
         :param model: SpaCy NER model to use (default: en_core_web_sm)
         """
+        # Define allowed labels
+        self.interesting_labels = {'PERSON', 'ORG'}
+
         try:
             self.nlp = spacy.load(model)
         except OSError:
@@ -21,16 +24,30 @@ class EntityExtractor:
         :param text: Input text to extract entities from
         :return: List of extracted entities
         """
-        # Define allowed labels
-        interesting_labels = ['PERSON', 'ORG']
-
         doc = self.nlp(text)
+        return self.entities_from_doc(doc)
+
+    def entity_spans(self, doc):
+        """
+        Return the PERSON and ORG entity spans of a processed document
+        
+        :param doc: SpaCy Doc
+        :return: List of SpaCy Span
+        """
+        return [ent for ent in doc.ents if ent.label_ in self.interesting_labels]
+
+    def entities_from_doc(self, doc):
+        """
+        Extract PERSON and ORG entities from an already processed document
+        
+        :param doc: SpaCy Doc
+        :return: List of extracted entities
+        """
         entities = [
             {
                 'text': ent.text, 
                 'label': ent.label_
             } 
-            for ent in doc.ents 
-            if ent.label_ == 'PERSON' or ent.label_ == 'ORG'
+            for ent in self.entity_spans(doc)
         ]
         return entities
\ No newline at end of file
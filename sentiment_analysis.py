@@ -1,11 +1,20 @@
 import re
 import string
+from sentiment_lexicon import LexiconMatcher, load_lexicon
 
 class SentimentAnalyzer:
-    def __init__(self):
+    def __init__(self, lexicon_path=None, invert_negated_negatives=False):
         """
         Initialize the Custom Sentiment Analyzer with predefined lexicons
+        
+        :param lexicon_path: Optional lexicon file (see sentiment_lexicon.load_lexicon)
+            whose entries, including multi-word phrases, extend the built-in words
+        :param invert_negated_negatives: Score negated negative words as positive
+            ("no loss"). Off by default, which keeps the original behaviour of
+            only inverting positive words; turning it on changes labels
         """
+        self.invert_negated_negatives = invert_negated_negatives
+
         # Lists of sentiment positive and negative words
         self.positive_words = {
             'good', 'great', 'excellent', 'awesome', 'wonderful', 'fantastic', 
@@ -37,6 +46,41 @@ class SentimentAnalyzer:
             'nothing', 'nobody', 'none', 'without'
         }
 
+        # Words that end the scope of a negation
+        self.reset_words = {'.', ',', ';', 'and', 'but', 'or'}
+
+        # Entries from the lexicon file, kept so other tokenizations can be compiled
+        self.lexicon_entries = load_lexicon(lexicon_path) if lexicon_path else []
+
+        self.matcher = self.build_matcher(self.preprocess_text)
+
+    def build_matcher(self, tokenize):
+        """
+        Compile the built-in word lists and the lexicon file entries into a matcher
+        
+        :param tokenize: Function turning a term into tokens, matching how the
+            text that will be scored is tokenized
+        :return: LexiconMatcher
+        """
+        matcher = LexiconMatcher(tokenize=tokenize,
+                                 invert_negated_negatives=self.invert_negated_negatives)
+        
+        for word in self.positive_words:
+            matcher.add(word, 'positive')
+        for word in self.negative_words:
+            matcher.add(word, 'negative')
+        for word, multiplier in self.intensity_multipliers.items():
+            matcher.add(word, 'intensifier', multiplier)
+        for word in self.negation_words:
+            matcher.add(word, 'negation')
+        for word in self.reset_words:
+            # Added untokenized so punctuation survives for token streams that keep it
+            matcher.add_tokens([word], 'reset')
+        
+        matcher.add_entries(self.lexicon_entries)
+        
+        return matcher
+
     def preprocess_text(self, text):
         """
         Preprocess the input text
@@ -63,48 +107,27 @@ class SentimentAnalyzer:
             text = text[:max_length]
             words = self.preprocess_text(text)
             
-            # Sentiment tracking variables
-            sentiment_score = 0
-            negation_active = False
+            # Single pass over the tokens; phrases are matched longest-first
+            sentiment_score = self.matcher.score(words)
             
-            # Analyze each word
-            for i, word in enumerate(words):
-                # Check for intensity multipliers
-                if word in self.intensity_multipliers:
-                    # Look ahead to see if next word is sentiment-bearing
-                    if i + 1 < len(words):
-                        multiplier = self.intensity_multipliers[word]
-                        next_word = words[i+1]
-                        if next_word in self.positive_words:
-                            sentiment_score += 1 * multiplier
-                        elif next_word in self.negative_words:
-                            sentiment_score -= 1 * multiplier
-                
-                # Check for negation
-                if word in self.negation_words:
-                    negation_active = not negation_active
-                
-                # Check positive words
-                if word in self.positive_words:
-                    sentiment_score += 1 if not negation_active else -1
-                
-                # Check negative words
-                if word in self.negative_words:
-                    sentiment_score -= 1 if not negation_active else 1
-                
-                # Reset negation after each clause or sentiment word
-                if word in {'.', ',', ';', 'and', 'but', 'or'}:
-                    negation_active = False
-            
-            # Determine final sentiment
-            if sentiment_score > 1:
-                return 'positive'
-            elif sentiment_score < -1:
-                return 'negative'
-            else:
-                return 'neutral'
+            return self.label_for_score(sentiment_score)
         
         except Exception as e:
             print(f"Custom sentiment analysis error: {e}")
             return 'neutral'
 
+    def label_for_score(self, sentiment_score, threshold=1):
+        """
+        Map a sentiment score to a label
+        
+        :param sentiment_score: Score from the lexicon matcher
+        :param threshold: Score that must be exceeded (in either direction)
+            for a non-neutral label
+        :return: Sentiment label (positive/negative/neutral)
+        """
+        if sentiment_score > threshold:
+            return 'positive'
+        elif sentiment_score < -threshold:
+            return 'negative'
+        else:
+            return 'neutral'
@@ -0,0 +1,189 @@
+import logging
+
+# Lexicon entry types
+POSITIVE = 'positive'
+NEGATIVE = 'negative'
+INTENSIFIER = 'intensifier'
+NEGATION = 'negation'
+RESET = 'reset'
+
+ENTRY_TYPES = {POSITIVE, NEGATIVE, INTENSIFIER, NEGATION, RESET}
+
+# Key under which a trie node stores the entry ending at that node
+_END = None
+
+
+def load_lexicon(path):
+    """
+    Load a lexicon file.
+
+    One entry per line, tab separated: term, type and an optional value.
+    The type is positive, negative, intensifier, negation or reset; the
+    value is the sentiment weight (default 1.0) or, for intensifiers, the
+    multiplier. Terms may be multi-word phrases. Blank lines and lines
+    starting with '#' are ignored.
+
+        fell short<TAB>negative<TAB>1.5
+        record high<TAB>positive
+        very<TAB>intensifier<TAB>2.0
+
+    :param path: Path to the lexicon file
+    :return: List of (term, type, value) tuples
+    """
+    entries = []
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            fields = line.split('\t')
+            if len(fields) < 2 or fields[1].strip().lower() not in ENTRY_TYPES:
+                logging.warning(f"Skipping malformed lexicon line {path}:{line_number}")
+                continue
+
+            term, entry_type = fields[0].strip(), fields[1].strip().lower()
+            try:
+                value = float(fields[2]) if len(fields) > 2 and fields[2].strip() else 1.0
+            except ValueError:
+                logging.warning(f"Skipping lexicon line with bad value {path}:{line_number}")
+                continue
+            entries.append((term, entry_type, value))
+
+    logging.info(f"Loaded {len(entries)} lexicon entries from {path}")
+    return entries
+
+
+class LexiconMatcher:
+    def __init__(self, tokenize=str.split, invert_negated_negatives=False):
+        """
+        Token trie matching single words and multi-word phrases in one pass.
+
+        Each position only walks as far as the longest phrase that starts
+        there, so matching cost does not grow with the lexicon size.
+
+        :param tokenize: Function turning a term into tokens; must match
+            how the analyzed text is tokenized
+        :param invert_negated_negatives: Let negation turn negative terms
+            positive ("no loss"); by default, as in the original word loop,
+            negation only inverts positive terms
+        """
+        self.tokenize = tokenize
+        self.invert_negated_negatives = invert_negated_negatives
+        self.root = {}
+        self.size = 0
+
+    def add(self, term, entry_type, value=1.0):
+        """
+        Add (or replace) a lexicon entry
+
+        :param term: Word or phrase
+        :param entry_type: One of ENTRY_TYPES
+        :param value: Weight, or multiplier for intensifiers
+        """
+        self.add_tokens(self.tokenize(term), entry_type, value)
+
+    def add_tokens(self, tokens, entry_type, value=1.0):
+        """
+        Add an entry that is already tokenized (bypasses the tokenize function)
+
+        :param tokens: List of tokens
+        :param entry_type: One of ENTRY_TYPES
+        :param value: Weight, or multiplier for intensifiers
+        """
+        if not tokens:
+            return
+
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _END not in node:
+            self.size += 1
+        node[_END] = (entry_type, value)
+
+    def add_entries(self, entries):
+        """
+        Add (term, type, value) entries, e.g. from load_lexicon
+        """
+        for term, entry_type, value in entries:
+            self.add(term, entry_type, value)
+
+    def units(self, tokens):
+        """
+        Split tokens into lexicon matches, preferring the longest phrase
+
+        :param tokens: List of tokens
+        :return: List of (entry_type, value) per unit, None for plain tokens
+        """
+        root = self.root
+        units = []
+        i = 0
+        count = len(tokens)
+
+        while i < count:
+            node = root.get(tokens[i])
+            if node is None:
+                units.append(None)
+                i += 1
+                continue
+
+            match = node.get(_END)
+            length = 1
+            j = i + 1
+            while j < count:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    match = node[_END]
+                    length = j - i
+
+            units.append(match)
+            i += length
+
+        return units
+
+    def score(self, tokens):
+        """
+        Score tokens with the intensity and negation rules of SentimentAnalyzer
+
+        An intensifier adds its multiplier (times the weight) when the next
+        unit carries sentiment; negation flips positive sentiment (and
+        negative sentiment if invert_negated_negatives is set) until a
+        reset unit.
+
+        :param tokens: List of tokens
+        :return: Numeric sentiment score
+        """
+        units = self.units(tokens)
+        sentiment_score = 0
+        negation_active = False
+        invert_negatives = self.invert_negated_negatives
+
+        for i, unit in enumerate(units):
+            if unit is None:
+                continue
+            entry_type, value = unit
+
+            if entry_type == INTENSIFIER:
+                if i + 1 < len(units) and units[i + 1] is not None:
+                    next_type, next_value = units[i + 1]
+                    if next_type == POSITIVE:
+                        sentiment_score += value * next_value
+                    elif next_type == NEGATIVE:
+                        sentiment_score -= value * next_value
+
+            elif entry_type == NEGATION:
+                negation_active = not negation_active
+
+            elif entry_type == POSITIVE:
+                sentiment_score += value if not negation_active else -value
+
+            elif entry_type == NEGATIVE:
+                sentiment_score -= value if not (negation_active and invert_negatives) else -value
+
+            elif entry_type == RESET:
+                negation_active = False
+
+        return sentiment_score
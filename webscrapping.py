@@ -1,13 +1,41 @@
 import requests
 from bs4 import BeautifulSoup
+from extraction_profiles import ExtractionProfiles, domain_of
+
+# Title strategies in fallback order
+TITLE_STRATEGIES = ['og:title', 'title', 'h1']
+
+# Content extraction strategies in fallback order
+CONTENT_SELECTORS = [
+    'article', 
+    'div.article-body', 
+    'div.content', 
+    'div.main-content',
+    'body'
+]
+
+# Catch-all strategies match almost any page, so they are used as fallbacks
+# but never learned: the more specific strategies keep being tried first
+CATCH_ALL_STRATEGIES = {'title', 'body'}
+
+# A learned selector is abandoned for a page when it yields less than this
+# fraction of its usual amount of text (e.g. it matched a teaser block)
+MIN_YIELD_RATIO = 0.2
 
 class WebScraper:
-    def __init__(self, headers=None):
+    def __init__(self, headers=None, profiles=None):
         """
         Initialize WebScraper with optional custom headers
         
         :param headers: Optional dictionary of HTTP headers
+        :param profiles: Optional ExtractionProfiles; False disables learning.
+            By default profiles are shared through $EXTRACTION_PROFILES when
+            it is set and kept in memory otherwise
         """
+        if profiles is None:
+            profiles = ExtractionProfiles.default()
+        self.profiles = profiles or None
+
         if headers is None:
             self.headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -26,67 +54,171 @@ class WebScraper:
         """
         try:
             # Send request
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.fetch(url)
             response.raise_for_status()
 
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract title and content
-            title = self._extract_title(soup)
-            content = self._extract_content(soup)
-
-            return {
-                'title': title,
-                'text': content
-            }
+            return self.parse_article(response.content, url)
         except Exception as e:
             print(f"Comprehensive scraping error for {url}: {e}")
             return None
 
-    def _extract_title(self, soup):
+    def fetch(self, url, timeout=10, headers=None):
+        """
+        Send the HTTP request for a URL without interpreting the response
+        
+        :param url: URL to fetch
+        :param timeout: Request timeout in seconds
+        :param headers: Optional extra headers (e.g. conditional request headers)
+        :return: requests.Response (status is not checked)
+        """
+        request_headers = dict(self.headers, **headers) if headers else self.headers
+        return requests.get(url, headers=request_headers, timeout=timeout)
+
+    def parse_article(self, html, url=None):
+        """
+        Parse an article page that has already been fetched
+        
+        :param html: Raw HTML content of the page
+        :param url: Optional page URL, used to apply the domain's extraction profile
+        :return: Dictionary containing article title and text
+        """
+        # Parse HTML
+        soup = BeautifulSoup(html, 'html.parser')
+        domain = domain_of(url)
+        
+        # Extract title and content
+        title = self._extract_title(soup, domain)
+        content = self._extract_content(soup, domain)
+
+        return {
+            'title': title,
+            'text': content
+        }
+
+    def _learned(self, domain, kind):
+        """
+        Return the strategy learned for a domain, ignoring catch-alls
+        
+        :param domain: Domain from domain_of()
+        :param kind: 'title' or 'content'
+        :return: Strategy or None
+        """
+        if not self.profiles:
+            return None
+        learned = self.profiles.strategy(domain, kind)
+        return None if learned in CATCH_ALL_STRATEGIES else learned
+
+    def _record_fallback(self, domain, kind, strategy, extracted_chars):
+        """
+        Record a result found by probing the strategies in order
+        """
+        if self.profiles:
+            learnable = strategy if strategy not in CATCH_ALL_STRATEGIES else None
+            self.profiles.record(domain, kind, learnable, extracted_chars, fell_back=True)
+
+    def _title_from(self, soup, strategy):
+        """
+        Apply a single title strategy
+        
+        :param soup: BeautifulSoup parsed HTML
+        :param strategy: One of TITLE_STRATEGIES
+        :return: Stripped title text, or None if the strategy found nothing
+        """
+        if strategy == 'og:title':
+            title_tag = soup.find('meta', property='og:title')
+        else:
+            title_tag = soup.find(strategy)
+        
+        if title_tag:
+            title = title_tag.get('content', title_tag.text).strip()
+            if title:
+                return title
+        return None
+
+    def _extract_title(self, soup, domain=None):
         """
         Extract title with multiple fallback methods
         
+        The strategy learned for the domain is tried first; the remaining
+        strategies are only probed when it finds nothing.
+        
         :param soup: BeautifulSoup parsed HTML
+        :param domain: Optional domain used to look up and update its profile
         :return: Extracted title or 'No Title Found'
         """
-        title_options = [
-            soup.find('meta', property='og:title'),
-            soup.find('title'),
-            soup.find('h1')
-        ]
+        learned = self._learned(domain, 'title')
         
-        for title_tag in title_options:
-            if title_tag:
-                return title_tag.get('content', title_tag.text).strip()
+        if learned in TITLE_STRATEGIES:
+            title = self._title_from(soup, learned)
+            if title:
+                self.profiles.record(domain, 'title', learned, len(title), fell_back=False)
+                return title
+        
+        for strategy in TITLE_STRATEGIES:
+            if strategy == learned:
+                continue
+            title = self._title_from(soup, strategy)
+            if title:
+                self._record_fallback(domain, 'title', strategy, len(title))
+                return title
         
         return 'No Title Found'
 
-    def _extract_content(self, soup):
+    def _content_from(self, soup, selector):
+        """
+        Apply a single content selector
+        
+        :param soup: BeautifulSoup parsed HTML
+        :param selector: One of CONTENT_SELECTORS
+        :return: Joined paragraph text, or None if the selector found nothing
+        """
+        content_div = soup.select_one(selector)
+        if content_div:
+            # Extract text, remove extra whitespaces
+            texts = (p.get_text(strip=True) for p in content_div.find_all(['p', 'div']))
+            content = ' '.join(text for text in texts if text)
+            if content:
+                return content
+        return None
+
+    def _extract_content(self, soup, domain=None):
         """
         Advanced content extraction
         
+        The selector learned for the domain is tried first and kept when its
+        yield is in line with earlier pages; otherwise the other selectors
+        are probed in order as before. A low-yield page (e.g. a teaser) does
+        not replace the learned selector or change its yield average.
+        
         :param soup: BeautifulSoup parsed HTML
+        :param domain: Optional domain used to look up and update its profile
         :return: Extracted article content or 'No Content Found'
         """
-        # Content extraction strategies
-        content_selectors = [
-            'article', 
-            'div.article-body', 
-            'div.content', 
-            'div.main-content',
-            'body'
-        ]
-        
-        for selector in content_selectors:
-            content_div = soup.select_one(selector)
-            if content_div:
-                # Extract text, remove extra whitespaces
-                paragraphs = content_div.find_all(['p', 'div'])
-                content = ' '.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                
-                if content:
-                    return content
-        
-        return 'No Content Found'
\ No newline at end of file
+        learned = self._learned(domain, 'content')
+        rejected = None
+        
+        if learned in CONTENT_SELECTORS:
+            content = self._content_from(soup, learned)
+            average = self.profiles.average_yield(domain, 'content')
+            if content and (not average or len(content) >= MIN_YIELD_RATIO * average):
+                self.profiles.record(domain, 'content', learned, len(content), fell_back=False)
+                return content
+            rejected = content
+        
+        for selector in CONTENT_SELECTORS:
+            if selector == learned:
+                continue
+            content = self._content_from(soup, selector)
+            if content:
+                if rejected:
+                    self.profiles.record(domain, 'content', None, 0, fell_back=True)
+                else:
+                    self._record_fallback(domain, 'content', selector, len(content))
+                return content
+        
+        if rejected:
+            # Nothing else matched; the short text is still better than nothing
+            self.profiles.record(domain, 'content', None, 0, fell_back=True)
+            return rejected
+        
+        return 'No Content Found'